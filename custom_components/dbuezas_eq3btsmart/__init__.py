@@ -9,12 +9,28 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from . import config_flow
+from .cache import DeviceCache
 from .python_eq3bt import eq3bt as eq3  # pylint: disable=import-error
+from .python_eq3bt.eq3bt.slots import SlotScheduler
+from .python_eq3bt.eq3bt.tracing import NULL_TRACER, Tracer
 from .const import (
     CONF_ADAPTER,
+    CONF_HEDGE_REQUESTS,
+    CONF_IDLE_TIMEOUT,
+    CONF_TRACING,
+    DATA_CACHE,
+    DATA_SCHEDULER,
+    DATA_TRACER,
     DEFAULT_ADAPTER,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_IDLE_TIMEOUT,
     CONF_STAY_CONNECTED,
+    CONF_TIMEOUT_CEILING,
+    CONF_TIMEOUT_FLOOR,
     DEFAULT_STAY_CONNECTED,
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_TIMEOUT_FLOOR,
+    DEFAULT_TRACING,
     DOMAIN,
 )
 
@@ -36,6 +52,18 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hello World from a config entry."""
 
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CACHE not in domain_data:
+        domain_data[DATA_CACHE] = DeviceCache(hass)
+    cache: DeviceCache = domain_data[DATA_CACHE]
+    await cache.async_load()
+    # connection slots of the adapters and proxies, shared by all thermostats
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = SlotScheduler()
+    if DATA_TRACER not in domain_data:
+        # one timeline for all traced thermostats
+        domain_data[DATA_TRACER] = Tracer()
+
     # Store an instance of the "connecting" class that does the work of speaking
     # with your actual devices.
 
@@ -45,8 +73,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         adapter=entry.options.get(CONF_ADAPTER, DEFAULT_ADAPTER),
         stay_connected=entry.options.get(CONF_STAY_CONNECTED, DEFAULT_STAY_CONNECTED),
         hass=hass,
+        timeout_floor=entry.options.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR),
+        timeout_ceiling=entry.options.get(
+            CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING
+        ),
+        scheduler=domain_data[DATA_SCHEDULER],
+        hedge=entry.options.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS),
+        idle_timeout=entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+        tracer=domain_data[DATA_TRACER]
+        if entry.options.get(CONF_TRACING, DEFAULT_TRACING)
+        else NULL_TRACER,
+    )
+    cache.async_restore(thermostat)
+    thermostat.register_update_callback(
+        lambda: cache.async_update(thermostat), {"schedule", "device_data"}
     )
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = thermostat
+    domain_data[entry.entry_id] = thermostat
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
@@ -69,6 +111,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the cached data of a removed device."""
+    if (cache := hass.data.get(DOMAIN, {}).get(DATA_CACHE)) is not None:
+        cache.async_remove(entry.data["mac"])
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener. Called when integration options are changed"""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -1,10 +1,11 @@
 from .const import CONF_DEBUG_MODE, DOMAIN
+from .entity import Eq3Entity
 import json
 import logging
 
-from homeassistant.helpers.device_registry import format_mac
+from .python_eq3bt.eq3bt.bleakconnection import EVENT_BUSY, EVENT_CONNECTED
 from .python_eq3bt.eq3bt.eq3btsmart import Thermostat
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from datetime import time
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -36,27 +37,16 @@ async def async_setup_entry(
         async_add_entities(new_devices)
 
 
-class Base(BinarySensorEntity):
-    def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
-
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
+class Base(Eq3Entity, BinarySensorEntity):
+    """Binary sensor of an eQ-3 Bluetooth Smart thermostat."""
 
 
 class BusySensor(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_BUSY}
+        )
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_name = "Busy"
 
@@ -74,7 +64,9 @@ def json_serial(obj):
 class ConnectedSensor(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_CONNECTED}
+        )
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_name = "Connected"
         self._attr_device_class = "connectivity"
@@ -99,9 +91,10 @@ class ConnectedSensor(Base):
 
 
 class BatterySensor(Base):
+    _update_fields = {"low_battery", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Battery"
         self._attr_device_class = "battery"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -112,9 +105,10 @@ class BatterySensor(Base):
 
 
 class WindowOpenSensor(Base):
+    _update_fields = {"window_open", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Window Open"
         self._attr_device_class = "window"
 
@@ -124,9 +118,10 @@ class WindowOpenSensor(Base):
 
 
 class DSTSensor(Base):
+    _update_fields = {"dst", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "dSt"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -1,17 +1,13 @@
-import datetime
-
-from .python_eq3bt.eq3bt.structures import (
-    HOUR_24_PLACEHOLDER,
-)
 from .const import CONF_DEBUG_MODE, DOMAIN
+from .entity import Eq3Entity
 import logging
 
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import format_mac
 from .python_eq3bt.eq3bt.eq3btsmart import EQ3BT_MAX_TEMP, EQ3BT_MIN_TEMP, Thermostat
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from .python_eq3bt.eq3bt.lanes import Lane
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.button import ButtonEntity
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -97,75 +93,64 @@ async def async_setup_entry(
     )
 
 
-class Base(ButtonEntity):
+class Base(Eq3Entity, ButtonEntity):
     """Representation of an eQ-3 Bluetooth Smart thermostat."""
 
-    def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
-
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
 
 class FetchScheduleButton(Base):
+    _update_fields = {"schedule"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Fetch Schedule"
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # only refresh schedules that were fetched before and are now outdated
+        if len(self._thermostat.schedule) and not self._thermostat.is_schedule_fresh():
+            self.hass.async_create_task(self.refresh_schedule())
+
     async def async_press(self) -> None:
+        # the user may have changed it on the valve, do not trust the cache
+        self._thermostat.invalidate_schedule()
         await self.fetch_schedule()
 
+    async def refresh_schedule(self):
+        try:
+            await self.fetch_schedule()
+        except Exception as e:
+            _LOGGER.error(f"[{self._thermostat.name}] Error fetching schedule: {e}")
+
     async def fetch_schedule(self):
-        for x in range(0, 7):
-            await self._thermostat.async_query_schedule(x)
+        await self._thermostat.async_query_week()
         _LOGGER.debug(
-            "[%s] schedule (day %s): %s",
+            "[%s] schedule: %s",
             self._thermostat.name,
             self._thermostat.schedule,
         )
 
     async def set_schedule(self, **kwargs) -> None:
         _LOGGER.debug("[%s] set_schedule (day %s)", self._thermostat.name, kwargs)
-        for day in kwargs["days"]:
-            times = [
-                kwargs.get(f"next_change_at_{i}", datetime.time(0, 0)) for i in range(6)
-            ]
-            times[times.index(datetime.time(0, 0))] = HOUR_24_PLACEHOLDER
-            temps = [kwargs.get(f"target_temp_{i}", 0) for i in range(7)]
-            hours = []
-            for i in range(0, 6):
-                hours.append(
-                    {
-                        "target_temp": temps[i],
-                        "next_change_at": times[i],
-                    }
-                )
-            await self._thermostat.async_set_schedule(day=day, hours=hours)
+        hours = []
+        for i in range(7):
+            temp = kwargs.get(f"target_temp_{i}")
+            if temp is None:
+                break
+            # the last temperature is kept until 24:00
+            hours.append((temp, kwargs.get(f"next_change_at_{i}")))
+        elided = await self._thermostat.async_set_schedules(
+            days=kwargs["days"], hours=hours
+        )
+        _LOGGER.info(
+            "[%s] set_schedule: %s of %s days already up to date",
+            self._thermostat.name,
+            elided,
+            len(kwargs["days"]),
+        )
 
     @property
     def extra_state_attributes(self):
-        schedule = {}
-        for day in self._thermostat.schedule:
-            day_raw = self._thermostat.schedule[day]
-            day_nice = {"day": day}
-            for i, entry in enumerate(day_raw.hours):
-                day_nice[f"target_temp_{i}"] = entry.target_temp
-                if entry.next_change_at == HOUR_24_PLACEHOLDER:
-                    break
-                day_nice[f"next_change_at_{i}"] = entry.next_change_at.isoformat()
-            schedule[day] = day_nice
-
-        return schedule
+        return self._thermostat.schedule.as_attributes()
 
 
 class FetchButton(Base):
@@ -175,4 +160,4 @@ class FetchButton(Base):
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     async def async_press(self) -> None:
-        await self._thermostat.async_update()
+        await self._thermostat.async_update(lane=Lane.INTERACTIVE)
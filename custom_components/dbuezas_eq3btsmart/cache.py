@@ -0,0 +1,69 @@
+"""Persistent cache of slowly changing thermostat data."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .python_eq3bt.eq3bt.eq3btsmart import Thermostat
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.cache"
+SAVE_DELAY = 10  # seconds
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceCache:
+    """Serial, firmware and weekly schedule of every thermostat, keyed by MAC."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict] = {}
+        self._load_task: asyncio.Future | None = None
+
+    async def async_load(self) -> None:
+        """Load the cache, concurrent callers wait for the same load."""
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        data = await self._store.async_load()
+        if data:
+            self._devices = data.get("devices", {})
+        _LOGGER.debug("Loaded cached data of %s thermostats", len(self._devices))
+
+    @callback
+    def async_restore(self, thermostat: Thermostat) -> None:
+        """Restore the cached data of a thermostat, if any."""
+        data = self._devices.get(format_mac(thermostat.mac))
+        if data is None:
+            return
+        try:
+            thermostat.restore_cache_data(data)
+        except (KeyError, TypeError, ValueError) as ex:
+            _LOGGER.warning("[%s] Ignoring invalid cache: %s", thermostat.name, ex)
+
+    @callback
+    def async_update(self, thermostat: Thermostat) -> None:
+        """Schedule a save if the cacheable data of a thermostat changed."""
+        key = format_mac(thermostat.mac)
+        data = thermostat.cache_data()
+        if self._devices.get(key) == data:
+            return
+        self._devices[key] = data
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, mac: str) -> None:
+        if self._devices.pop(format_mac(mac), None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {"devices": self._devices}
@@ -22,12 +22,15 @@ from homeassistant.const import (
     PRECISION_TENTHS,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, format_mac
 from homeassistant.helpers.entity import DeviceInfo, EntityPlatformState
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 
 from .const import (
     CONF_CURRENT_TEMP_SELECTOR,
@@ -43,15 +46,30 @@ from .const import (
     Preset,
     TargetTemperatureSelector,
 )
+from .python_eq3bt.eq3bt import DeviceNotSeenError
 from .python_eq3bt.eq3bt.eq3btsmart import (
     EQ3BT_MAX_TEMP,
     EQ3BT_OFF_TEMP,
+    SETPOINT_DEBOUNCE,
     Mode,
     Thermostat,
 )
 
 _LOGGER = logging.getLogger(__name__)
 DEVICE_SCHEMA = vol.Schema({vol.Required(CONF_MAC): cv.string})
+# thermostat fields the climate entity renders
+CLIMATE_UPDATE_FIELDS = {
+    "target_temperature",
+    "mode",
+    "away",
+    "boost",
+    "valve_state",
+    "window_open",
+    "low_battery",
+    "comfort_temperature",
+    "eco_temperature",
+    "available",
+}
 
 
 async def async_setup_entry(
@@ -100,7 +118,7 @@ class EQ3Climate(ClimateEntity):
     ):
         """Initialize the thermostat."""
         self._thermostat = thermostat
-        self._thermostat.register_update_callback(self._on_updated)
+        self._thermostat.register_reappeared_callback(self._on_reappeared)
         self._scan_interval = scan_interval
         self._conf_current_temp_selector = conf_current_temp_selector
         self._conf_target_temp_selector = conf_target_temp_selector
@@ -109,6 +127,7 @@ class EQ3Climate(ClimateEntity):
         self._is_setting_temperature = False
         self._is_available = False
         self._cancel_timer = None
+        self._cancel_warm_up = None
         # This is the main entity of the device and should use the device name.
         # See https://developers.home-assistant.io/docs/core/entity#has_entity_name-true-mandatory-for-new-integrations
         self._attr_has_entity_name = True
@@ -132,18 +151,53 @@ class EQ3Climate(ClimateEntity):
         )
 
     async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self._thermostat.register_update_callback(
+                self._on_updated, CLIMATE_UPDATE_FIELDS
+            )
+        )
+        if (
+            self._conf_current_temp_selector == CurrentTemperatureSelector.ENTITY
+            and self._conf_external_temp_sensor
+        ):
+            # the current temperature is read from the sensor when rendered
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass,
+                    self._conf_external_temp_sensor,
+                    self._on_external_temp_changed,
+                )
+            )
         asyncio.get_event_loop().create_task(self._async_scan_loop())
 
     async def async_will_remove_from_hass(self) -> None:
         if self._cancel_timer:
             self._cancel_timer()
+        if self._cancel_warm_up:
+            self._cancel_warm_up()
 
     async def _async_scan_loop(self, now=None):
         await self.async_scan()
         if self._platform_state != EntityPlatformState.REMOVED:
+            interval = timedelta(minutes=self._scan_interval)
             self._cancel_timer = async_call_later(
-                self.hass, timedelta(minutes=self._scan_interval), self._async_scan_loop
+                self.hass, interval, self._async_scan_loop
             )
+            # connect ahead so the poll does not wait for it
+            lead = timedelta(seconds=self._thermostat.warm_up_lead)
+            if lead < interval:
+                self._cancel_warm_up = async_call_later(
+                    self.hass, interval - lead, self._async_warm_up
+                )
+
+    async def _async_warm_up(self, now=None):
+        self._cancel_warm_up = None
+        await self._thermostat.async_warm_up()
+
+    @callback
+    def _on_reappeared(self):
+        # poll right away instead of waiting for the next scan
+        self.hass.async_create_task(self.async_scan())
 
     @callback
     def _on_updated(self):
@@ -153,17 +207,16 @@ class EQ3Climate(ClimateEntity):
         if not self._is_setting_temperature:
             # temperature may have been updated from the thermostat
             self._target_temperature_to_set = self._thermostat.target_temperature
-        if self.entity_id is None:
-            _LOGGER.warn(
-                "[%s] Updated but the entity is not loaded", self._thermostat.name
-            )
-            return
-        self.schedule_update_ha_state()
+        self.async_write_ha_state()
+
+    @callback
+    def _on_external_temp_changed(self, event: Event):
+        self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         """Return if thermostat is available."""
-        return self._is_available
+        return self._is_available and self._thermostat.available
 
     @property
     def hvac_action(self) -> str | None:
@@ -236,15 +289,15 @@ class EQ3Climate(ClimateEntity):
         self.async_schedule_update_ha_state()
 
         try:
-            await self.async_set_temperature_now()
+            await self.async_set_temperature_now(debounce=SETPOINT_DEBOUNCE)
         except Exception as ex:
             _LOGGER.error(f"[{self._thermostat.name}] Failed setting temperature: {ex}")
             self._target_temperature_to_set = previous_temperature
             self.async_schedule_update_ha_state()
 
-    async def async_set_temperature_now(self):
+    async def async_set_temperature_now(self, debounce: float = 0):
         await self._thermostat.async_set_target_temperature(
-            self._target_temperature_to_set
+            self._target_temperature_to_set, debounce
         )
         self._is_setting_temperature = False
 
@@ -337,8 +390,16 @@ class EQ3Climate(ClimateEntity):
         """Update the data from the thermostat."""
         try:
             await self._thermostat.async_update()
+            if not self._is_available:
+                # an unchanged status does not call _on_updated
+                self._is_available = True
+                self.async_write_ha_state()
             if self._is_setting_temperature:
                 await self.async_set_temperature_now()
+        except DeviceNotSeenError as ex:
+            self._is_available = False
+            self.schedule_update_ha_state()
+            _LOGGER.debug("[%s] Skipping update: %s", self._thermostat.name, ex)
         except Exception as ex:
             self._is_available = False
             self.schedule_update_ha_state()
@@ -12,20 +12,31 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.helpers.selector import selector
 
+from .python_eq3bt.eq3bt.latency import TIMEOUT_FLOOR_MIN
 from .const import (
     CONF_ADAPTER,
     CONF_CURRENT_TEMP_SELECTOR,
     CONF_EXTERNAL_TEMP_SENSOR,
     CONF_STAY_CONNECTED,
     CONF_DEBUG_MODE,
+    CONF_HEDGE_REQUESTS,
+    CONF_IDLE_TIMEOUT,
     CONF_TARGET_TEMP_SELECTOR,
+    CONF_TIMEOUT_CEILING,
+    CONF_TIMEOUT_FLOOR,
+    CONF_TRACING,
     DEFAULT_TARGET_TEMP_SELECTOR,
     Adapter,
     CurrentTemperatureSelector,
     DEFAULT_ADAPTER,
     DEFAULT_CURRENT_TEMP_SELECTOR,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_IDLE_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_STAY_CONNECTED,
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_TIMEOUT_FLOOR,
+    DEFAULT_TRACING,
     DOMAIN,
     TargetTemperatureSelector,
 )
@@ -132,9 +143,15 @@ class OptionsFlowHandler(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input[CONF_TIMEOUT_FLOOR] > user_input[CONF_TIMEOUT_CEILING]:
+                errors["base"] = "timeout_range"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
+        # keep what was entered when the form is shown again
+        options = user_input or self.config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -142,7 +159,7 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(
                         CONF_SCAN_INTERVAL,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                             )
                         },
@@ -150,7 +167,7 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(
                         CONF_CURRENT_TEMP_SELECTOR,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_CURRENT_TEMP_SELECTOR,
                                 DEFAULT_CURRENT_TEMP_SELECTOR,
                             )
@@ -186,7 +203,7 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(
                         CONF_TARGET_TEMP_SELECTOR,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_TARGET_TEMP_SELECTOR,
                                 DEFAULT_TARGET_TEMP_SELECTOR,
                             )
@@ -210,7 +227,7 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Optional(
                         CONF_EXTERNAL_TEMP_SENSOR,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_EXTERNAL_TEMP_SENSOR, ""
                             )
                         },
@@ -220,7 +237,7 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(
                         CONF_ADAPTER,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_ADAPTER, DEFAULT_ADAPTER
                             )
                         },
@@ -257,19 +274,58 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(
                         CONF_STAY_CONNECTED,
                         description={
-                            "suggested_value": self.config_entry.options.get(
+                            "suggested_value": options.get(
                                 CONF_STAY_CONNECTED, DEFAULT_STAY_CONNECTED
                             )
                         },
                     ): cv.boolean,
                     vol.Required(
-                        CONF_DEBUG_MODE,
+                        CONF_IDLE_TIMEOUT,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT
+                            )
+                        },
+                    ): cv.positive_float,
+                    vol.Required(
+                        CONF_TIMEOUT_FLOOR,
                         description={
-                            "suggested_value": self.config_entry.options.get(
-                                CONF_DEBUG_MODE, False
+                            "suggested_value": options.get(
+                                CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR
                             )
                         },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=TIMEOUT_FLOOR_MIN)),
+                    vol.Required(
+                        CONF_TIMEOUT_CEILING,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING
+                            )
+                        },
+                    ): vol.All(vol.Coerce(float), vol.Range(min=TIMEOUT_FLOOR_MIN)),
+                    vol.Required(
+                        CONF_HEDGE_REQUESTS,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS
+                            )
+                        },
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_TRACING,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_TRACING, DEFAULT_TRACING
+                            )
+                        },
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_DEBUG_MODE,
+                        description={
+                            "suggested_value": options.get(CONF_DEBUG_MODE, False)
+                        },
                     ): cv.boolean,
                 }
             ),
+            errors=errors,
         )
@@ -1,9 +1,14 @@
 """Constants for EQ3 Bluetooth Smart Radiator Valves."""
+from .python_eq3bt.eq3bt import Adapter
 from .python_eq3bt.eq3bt.eq3btsmart import Mode
 from homeassistant.components.climate import HVACMode
 from enum import Enum
 
 DOMAIN = "dbuezas_eq3btsmart"
+# shared objects stored next to the thermostats in hass.data[DOMAIN]
+DATA_CACHE = "cache"
+DATA_SCHEDULER = "scheduler"
+DATA_TRACER = "tracer"
 from homeassistant.components.climate.const import (
     PRESET_AWAY,
     PRESET_BOOST,
@@ -39,16 +44,16 @@ CONF_CURRENT_TEMP_SELECTOR = "conf_current_temp_selector"
 CONF_TARGET_TEMP_SELECTOR = "conf_target_temp_selector"
 CONF_EXTERNAL_TEMP_SENSOR = "conf_external_temp_sensor"
 CONF_STAY_CONNECTED = "conf_stay_connected"
+CONF_IDLE_TIMEOUT = "conf_idle_timeout"
+CONF_TRACING = "conf_tracing"
 CONF_DEBUG_MODE = "conf_debug_mode"
+CONF_TIMEOUT_FLOOR = "conf_timeout_floor"
+CONF_TIMEOUT_CEILING = "conf_timeout_ceiling"
+CONF_HEDGE_REQUESTS = "conf_hedge_requests"
 
 DEFAULT_SCAN_INTERVAL = 1  # minutes
 
 
-class Adapter(str, Enum):
-    AUTO = "AUTO"
-    LOCAL = "LOCAL"
-
-
 class CurrentTemperatureSelector(str, Enum):
     NOTHING = "NOTHING"
     UI = "UI"
@@ -65,3 +70,8 @@ DEFAULT_ADAPTER = Adapter.AUTO
 DEFAULT_CURRENT_TEMP_SELECTOR = CurrentTemperatureSelector.UI
 DEFAULT_TARGET_TEMP_SELECTOR = TargetTemperatureSelector.TARGET
 DEFAULT_STAY_CONNECTED = True
+DEFAULT_IDLE_TIMEOUT = 0.0  # seconds, 0 disconnects right after each request
+DEFAULT_TIMEOUT_FLOOR = 1.0  # seconds
+DEFAULT_TIMEOUT_CEILING = 10.0  # seconds
+DEFAULT_HEDGE_REQUESTS = False
+DEFAULT_TRACING = False
@@ -0,0 +1,61 @@
+"""Diagnostics support for dbuezas_eQ-3 Bluetooth Smart thermostats."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import DATA_SCHEDULER, DATA_TRACER, DOMAIN
+from .python_eq3bt.eq3bt.eq3btsmart import Thermostat
+
+# diagnostics are shared in issue reports
+TO_REDACT = {CONF_MAC, "address"}
+# names the thermostat in the traces instead of its mac
+TRACE_LABEL = "this thermostat"
+
+
+def _thermostat_diagnostics(thermostat: Thermostat) -> dict[str, Any]:
+    data = {
+        "name": thermostat.name,
+        "mac": thermostat.mac,
+        "available": thermostat.available,
+        "firmware_version": thermostat.firmware_version,
+        "connection": thermostat._conn.diagnostics(),
+    }
+    if thermostat.tracer.enabled:
+        # save this object alone to open it in chrome://tracing or Perfetto
+        data["trace"] = thermostat.tracer.export(
+            thermostat.mac, {thermostat.mac: TRACE_LABEL}
+        )
+    return async_redact_data(data, TO_REDACT)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data[DOMAIN]
+    thermostat: Thermostat = domain_data[entry.entry_id]
+    scheduler = domain_data.get(DATA_SCHEDULER)
+    data = {
+        "options": dict(entry.options),
+        "thermostat": _thermostat_diagnostics(thermostat),
+        # shared by all thermostats, shows who else competes for the slots
+        "slots": scheduler.as_dict() if scheduler is not None else None,
+    }
+    if thermostat.tracer.enabled and (tracer := domain_data.get(DATA_TRACER)):
+        # every traced thermostat on one timeline
+        data["trace_all"] = tracer.export(labels={thermostat.mac: TRACE_LABEL})
+    return async_redact_data(data, TO_REDACT)
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a device."""
+    thermostat: Thermostat = hass.data[DOMAIN][entry.entry_id]
+    return _thermostat_diagnostics(thermostat)
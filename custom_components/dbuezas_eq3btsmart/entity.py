@@ -0,0 +1,44 @@
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.entity import DeviceInfo, Entity
+
+from .const import DOMAIN
+from .python_eq3bt.eq3bt.eq3btsmart import Thermostat
+
+
+class Eq3Entity(Entity):
+    """Entity of an eQ-3 Bluetooth Smart thermostat, rendered again whenever
+    one of its fields changes."""
+
+    # Thermostat fields rendered, see Thermostat.register_update_callback.
+    # Entities that render "available" follow the availability of the thermostat
+    _update_fields: set[str] = set()
+
+    def __init__(self, _thermostat: Thermostat):
+        self._thermostat = _thermostat
+        self._attr_has_entity_name = True
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._update_fields:
+            self.async_on_remove(
+                self._thermostat.register_update_callback(
+                    self.async_write_ha_state, self._update_fields
+                )
+            )
+
+    @property
+    def unique_id(self) -> str:
+        assert self.name
+        return format_mac(self._thermostat.mac) + "_" + self.name
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._thermostat.mac)},
+        )
+
+    @property
+    def available(self) -> bool:
+        if "available" in self._update_fields:
+            return self._thermostat.available
+        return super().available
@@ -1,9 +1,9 @@
 from .const import DOMAIN
+from .entity import Eq3Entity
 import logging
 
-from homeassistant.helpers.device_registry import format_mac
 from .python_eq3bt.eq3bt.eq3btsmart import Mode, Thermostat
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.lock import LockEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
@@ -25,28 +25,15 @@ async def async_setup_entry(
     async_add_entities(new_devices)
 
 
-class Base(LockEntity):
-    def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
-
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
+class Base(Eq3Entity, LockEntity):
+    """Lock of an eQ-3 Bluetooth Smart thermostat."""
 
 
 class LockedSwitch(Base):
+    _update_fields = {"locked", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Locked"
 
     async def async_lock(self, **kwargs):
@@ -58,4 +45,3 @@ class LockedSwitch(Base):
     @property
     def is_locked(self):
         return self._thermostat.locked
-
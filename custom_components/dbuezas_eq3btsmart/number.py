@@ -1,16 +1,17 @@
 from datetime import timedelta
 from .const import DOMAIN
+from .entity import Eq3Entity
 import logging
 
-from homeassistant.helpers.device_registry import format_mac
 from .python_eq3bt.eq3bt.eq3btsmart import (
     EQ3BT_MAX_OFFSET,
     EQ3BT_MAX_TEMP,
     EQ3BT_MIN_OFFSET,
     EQ3BT_MIN_TEMP,
+    SETPOINT_DEBOUNCE,
     Thermostat,
 )
-from homeassistant.helpers.entity import DeviceInfo
+from .python_eq3bt.eq3bt.lanes import Lane
 from homeassistant.components.number import NumberEntity, NumberMode, RestoreNumber
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
@@ -39,11 +40,11 @@ async def async_setup_entry(
     async_add_entities(new_devices)
 
 
-class Base(NumberEntity):
+class Base(Eq3Entity, NumberEntity):
+    """Temperature of an eQ-3 Bluetooth Smart thermostat."""
+
     def __init__(self, _thermostat: Thermostat):
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
+        super().__init__(_thermostat)
         self._attr_device_class = "temperature"
         self._attr_native_unit_of_measurement = "°C"
         self._attr_native_min_value = EQ3BT_MIN_TEMP
@@ -52,19 +53,10 @@ class Base(NumberEntity):
         self._attr_native_step = 0.5
         self._attr_mode = NumberMode.BOX
 
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
 
 class ComfortTemperature(Base):
+    _update_fields = {"comfort_temperature", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
         self._attr_name = "Comfort"
@@ -74,12 +66,16 @@ class ComfortTemperature(Base):
         return self._thermostat.comfort_temperature
 
     async def async_set_native_value(self, value: float) -> None:
-        await self._thermostat.async_update()  # to ensure the other temp is up to date
-        other = self._thermostat.eco_temperature
-        await self._thermostat.async_temperature_presets(comfort=value, eco=other)
+        # the eco temperature is taken from the latest status
+        await self._thermostat.async_update(lane=Lane.INTERACTIVE)
+        await self._thermostat.async_temperature_presets(
+            comfort=value, debounce=SETPOINT_DEBOUNCE
+        )
 
 
 class EcoTemperature(Base):
+    _update_fields = {"eco_temperature", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
         self._attr_name = "Eco"
@@ -89,12 +85,16 @@ class EcoTemperature(Base):
         return self._thermostat.eco_temperature
 
     async def async_set_native_value(self, value: float) -> None:
-        await self._thermostat.async_update()  # to ensure the other temp is up to date
-        other = self._thermostat.comfort_temperature
-        await self._thermostat.async_temperature_presets(comfort=other, eco=value)
+        # the comfort temperature is taken from the latest status
+        await self._thermostat.async_update(lane=Lane.INTERACTIVE)
+        await self._thermostat.async_temperature_presets(
+            eco=value, debounce=SETPOINT_DEBOUNCE
+        )
 
 
 class OffsetTemperature(Base):
+    _update_fields = {"temperature_offset", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
         self._attr_name = "Offset"
@@ -106,10 +106,14 @@ class OffsetTemperature(Base):
         return self._thermostat.temperature_offset
 
     async def async_set_native_value(self, value: float) -> None:
-        await self._thermostat.async_set_temperature_offset(value)
+        await self._thermostat.async_set_temperature_offset(
+            value, debounce=SETPOINT_DEBOUNCE
+        )
 
 
 class WindowOpenTemperature(Base):
+    _update_fields = {"window_open_temperature", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
         self._attr_name = "Window Open"
@@ -119,17 +123,18 @@ class WindowOpenTemperature(Base):
         return self._thermostat.window_open_temperature
 
     async def async_set_native_value(self, value: float) -> None:
-        await self._thermostat.async_update()  # to ensure the other value is up to date
+        # to ensure the other value is up to date
+        await self._thermostat.async_update(lane=Lane.INTERACTIVE)
         await self._thermostat.async_window_open_config(
             temperature=value, duration=self._thermostat.window_open_time
         )
 
 
-class WindowOpenTimeout(NumberEntity):
+class WindowOpenTimeout(Eq3Entity, NumberEntity):
+    _update_fields = {"window_open_time", "available"}
+
     def __init__(self, _thermostat: Thermostat):
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
+        super().__init__(_thermostat)
         self._attr_mode = NumberMode.BOX
         self._attr_name = "Window Open Timeout"
         self._attr_native_min_value = 0
@@ -137,17 +142,6 @@ class WindowOpenTimeout(NumberEntity):
         self._attr_native_step = 5
         self._attr_native_unit_of_measurement = "minutes"
 
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
     @property
     def native_value(self):
         if self._thermostat.window_open_time is None:
@@ -155,17 +149,17 @@ class WindowOpenTimeout(NumberEntity):
         return self._thermostat.window_open_time.total_seconds() / 60
 
     async def async_set_native_value(self, value: float) -> None:
-        await self._thermostat.async_update()  # to ensure the other value is up to date
+        # to ensure the other value is up to date
+        await self._thermostat.async_update(lane=Lane.INTERACTIVE)
         await self._thermostat.async_window_open_config(
             temperature=self._thermostat.window_open_temperature,
             duration=timedelta(minutes=value),
         )
 
 
-class AwayForHours(RestoreNumber):
+class AwayForHours(Eq3Entity, RestoreNumber):
     def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
+        super().__init__(_thermostat)
         self._attr_mode = NumberMode.BOX
         self._attr_name = "Away Hours"
         self._attr_native_min_value = 0.5
@@ -173,20 +167,9 @@ class AwayForHours(RestoreNumber):
         self._attr_native_step = 0.5
         self._attr_native_unit_of_measurement = "hours"
 
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
     async def async_added_to_hass(self) -> None:
         """Restore last state."""
-
+        await super().async_added_to_hass()
         data = await self.async_get_last_number_data()
         if data and data.native_value != None:
             self._thermostat.default_away_hours = data.native_value
@@ -200,23 +183,15 @@ class AwayForHours(RestoreNumber):
 
 
 class AwayTemperature(Base, RestoreNumber):
+    _update_fields = {"available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
         self._attr_name = "Away"
 
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
-
     async def async_added_to_hass(self) -> None:
         """Restore last state."""
+        await super().async_added_to_hass()
         data = await self.async_get_last_number_data()
         if data and data.native_value != None:
             self._thermostat.default_away_temp = data.native_value
@@ -1,6 +1,23 @@
 # flake8: noqa
+from enum import Enum
+
 from .structures import *
 
 
+class Adapter(str, Enum):
+    """How the device is reached, an adapter can also be named by its path."""
+
+    AUTO = "AUTO"
+    LOCAL = "LOCAL"
+
+
 class BackendException(Exception):
     """Exception to wrap backend exceptions."""
+
+
+class CircuitOpenError(BackendException):
+    """The device failed too often, requests fail fast for a while."""
+
+
+class DeviceNotSeenError(BackendException):
+    """The device was not heard lately, it is out of range or out of battery."""
@@ -4,25 +4,64 @@ This creates a new event loop that is used to integrate bleak's
 asyncio functions to synchronous architecture of python-eq3bt.
 """
 import asyncio
+import contextlib
 import logging
-import asyncio
 
 from bleak import BleakClient
 from bleak.backends.characteristic import BleakGATTCharacteristic
-from bleak_retry_connector import NO_RSSI_VALUE, establish_connection
-from ...const import Adapter
+from bleak_retry_connector import establish_connection
 from homeassistant.components import bluetooth
 from homeassistant.core import HomeAssistant, callback
 
-from . import BackendException
-from typing import TYPE_CHECKING, cast
+from . import Adapter, BackendException, CircuitOpenError, DeviceNotSeenError
+from .encoder import PROP_INFO_QUERY, is_idempotent, response_prefix
+from .latency import (
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_TIMEOUT_FLOOR,
+    TIMEOUT_FLOOR_MIN,
+    LatencyEstimator,
+)
+from .metrics import RequestMetrics
+from .paths import NO_RSSI, CachedPath, PathCache, PathSelector
+from .retry import CircuitBreaker, backoff_delay
+from .slots import LOCAL_ADAPTER_SLOTS, PROXY_SLOTS, SlotScheduler, SourceSlots
+from .lanes import Lane
+from .tracing import NULL_TRACER, Tracer
+from typing import cast
 
 from bleak.backends.device import BLEDevice
 
-REQUEST_TIMEOUT = 5
-RETRY_BACK_OFF_FACTOR = 0.25
+REQUEST_TIMEOUT = 5  # until the latency of a path is known
 RETRIES = 14
 
+# hedge a query once its answer is later than this fraction of recent ones
+HEDGE_PERCENTILE = 0.9
+
+# requests fail fast when the device was not heard for this long
+PRESENCE_TIMEOUT = 600.0  # seconds
+
+# warm-up lead before a planned poll, a multiple of the usual connect time
+WARM_UP_LEAD = 5.0  # seconds, until connect times are known
+WARM_UP_FACTOR = 2
+WARM_UP_LEAD_MIN = 1.0
+WARM_UP_LEAD_MAX = 20.0
+
+# the rssi is reported again once it moved this much, it jitters by a few dB
+RSSI_HYSTERESIS = 3  # dB
+
+# connection events are collected this long, then reported together
+CONNECTION_EVENT_WINDOW = 1.0  # seconds
+
+# fields a connection event can report as changed
+EVENT_CONNECTED = "connected"
+EVENT_RETRIES = "retries"
+EVENT_BUSY = "busy"
+EVENT_RSSI = "rssi"
+EVENT_STATS = "stats"  # counters, latency, breaker, paths and slots
+
+# lengths of the response prefixes, longest first
+RESPONSE_PREFIX_SIZES = (3, 2, 1)
+
 # Handles in linux and BTProxy are off by 1. Using UUIDs instead for consistency
 PROP_WRITE_UUID = "3fa4585a-ce4a-3bad-db4b-b8df8179ea09"
 PROP_NTFY_UUID = "d0e8434d-cd29-0996-af41-6c90f4e0eb2a"
@@ -33,6 +72,47 @@ PROP_NTFY_UUID = "d0e8434d-cd29-0996-af41-6c90f4e0eb2a"
 _LOGGER = logging.getLogger(__name__)
 
 
+def _coalesce_key(value: bytes) -> bytes:
+    # status queries carry the current time, any of them answers all callers
+    if value[0] == PROP_INFO_QUERY:
+        return value[:1]
+    return bytes(value)
+
+
+def _device_details(ble_device: BLEDevice) -> dict:
+    return ble_device.details if isinstance(ble_device.details, dict) else {}
+
+
+def _device_adapter(ble_device: BLEDevice) -> str | None:
+    """Return the local adapter path a device is seen by, e.g. /org/bluez/hci0."""
+    return _device_details(ble_device).get("props", {}).get("Adapter")
+
+
+def _unwrapped_client(ble_device: BLEDevice, **kwargs) -> BleakClient:
+    """A client bound to this very path, not the one Home Assistant prefers."""
+    UnwrappedBleakClient = cast(type[BleakClient], BleakClient.__bases__[0])
+    return UnwrappedBleakClient(ble_device, dangerous_use_bleak_cache=True, **kwargs)
+
+
+def _outcome(ex: Exception | None) -> str:
+    if ex is None:
+        return "ok"
+    if isinstance(ex, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(ex, DeviceNotSeenError):
+        return "not_seen"
+    if isinstance(ex, asyncio.TimeoutError):
+        return "timeout"
+    return "error"
+
+
+def _slot_limit(ble_device: BLEDevice) -> int:
+    # only devices seen by a local BlueZ adapter have a D-Bus path
+    if "path" in _device_details(ble_device):
+        return LOCAL_ADAPTER_SLOTS
+    return PROXY_SLOTS
+
+
 class BleakConnection:
     """Representation of a BTLE Connection."""
 
@@ -44,30 +124,203 @@ class BleakConnection:
         stay_connected: bool,
         hass: HomeAssistant,
         callback,
+        timeout_floor: float = DEFAULT_TIMEOUT_FLOOR,
+        timeout_ceiling: float = DEFAULT_TIMEOUT_CEILING,
+        scheduler: SlotScheduler | None = None,
+        hedge: bool = False,
+        idle_timeout: float = 0,
+        tracer: Tracer = NULL_TRACER,
     ):
         """Initialize the connection."""
         self._mac = mac
         self._name = name
         self._adapter = adapter
         self._stay_connected = stay_connected
+        # without stay connected, keep the link this many seconds after a session
+        self._idle_timeout = idle_timeout
+        self._idle_timer: asyncio.TimerHandle | None = None
         self._hass = hass
         self._callback = callback
         self._notify_event = asyncio.Event()
+        # requests waiting for the connection and those sent but not answered
+        self._queue: list[_Request] = []
+        self._pending: list[_Request] = []
+        # pending requests by the prefix of their expected response
+        self._waiting: dict[bytes, list[_Request]] = {}
+        self._worker: asyncio.Task | None = None
+        # set when a user command waits behind background requests
+        self._preempt = asyncio.Event()
+        # background requests set aside for the next session
+        self._deferred: list[_Request] = []
+        self.requests_deferred = 0
         self._terminate_event = asyncio.Event()
         self.rssi = None
+        self._reported_rssi: int | None = None
         self._lock = asyncio.Lock()
         self._conn: BleakClient | None = None
+        # the client whose notifications are subscribed, kept while connected
+        self._subscribed: BleakClient | None = None
         self._ble_device: BLEDevice | None = None
         self._connection_callbacks = []
+        # fields changed since the connection callbacks were last called
+        self._changed: set[str] = set()
+        self._event_timer: asyncio.TimerHandle | None = None
         self.retries = 0
-        self._round_robin = 0
+        self.metrics = RequestMetrics()
+        self.tracer = tracer
+        # track record of the adapters and proxies that reach the device
+        self._paths = PathSelector()
+        self._connect_time: float | None = None
+        # single flight: queries that are queued or in flight, by coalesce key
+        self._inflight: dict[bytes, _Request] = {}
+        self.requests_total = 0
+        self.requests_coalesced = 0
+        # last writer wins: setpoint requests not sent yet, by setpoint key
+        self._setpoints: dict[str, _Request] = {}
+        self.requests_superseded = 0
+        # response latency by the adapter or proxy the device is reached through
+        # clamped, so options saved by an older version cannot break requests
+        self._timeout_floor = max(TIMEOUT_FLOOR_MIN, timeout_floor)
+        self._timeout_ceiling = max(self._timeout_floor, timeout_ceiling)
+        self._latency: dict[str, LatencyEstimator] = {}
+        self.source: str | None = None
+        # fail fast while the device keeps failing
+        self.breaker = CircuitBreaker()
+        self._availability_callbacks = []
+        # connection slots shared with the other thermostats
+        self._scheduler = scheduler
+        # slot taken by the open link, given back when it is closed
+        self._held_slot: SourceSlots | None = None
+        # resend slow queries through a second path
+        self._hedge = hedge
+        self._hedge_answered = False
+        self.hedges_started = 0
+        self.hedges_won = 0
+        self.warm_ups = 0
+        # paths to the device, kept up to date by its advertisements
+        self._advertisements = PathCache()
+        self._advertisements.seen()  # give it the presence timeout to show up
+        # not heard for longer than PRESENCE_TIMEOUT, set by the first request
+        self.absent = False
+        self._reappeared_callbacks = []
+        self._cancel_advertisements = bluetooth.async_register_callback(
+            hass,
+            self._on_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=mac, connectable=True),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+
+    def register_connection_callback(
+        self, callback, fields: set[str] | None = None
+    ) -> None:
+        """callback(changed) gets the set of fields that changed, at most once
+        per CONNECTION_EVENT_WINDOW and only if one of fields (any by default) did."""
+        self._connection_callbacks.append((callback, fields))
+
+    def _on_connection_event(self, *fields: str) -> None:
+        """Report changed fields, a retry storm is reported as one event."""
+        self._changed.update(fields)
+        if self._event_timer is None:
+            self._event_timer = asyncio.get_running_loop().call_later(
+                CONNECTION_EVENT_WINDOW, self._flush_connection_events
+            )
+
+    def _flush_connection_events(self) -> None:
+        self._event_timer = None
+        changed, self._changed = frozenset(self._changed), set()
+        for cb, fields in self._connection_callbacks:
+            if fields is None or not changed.isdisjoint(fields):
+                cb(changed)
+
+    def _on_disconnected(self, client: BleakClient) -> None:
+        self._advertisements.seen()
+        if self._subscribed is client:
+            self._subscribed = None
+        if self._conn is client:
+            self._release_slot()
+        self._on_connection_event(EVENT_CONNECTED)
+
+    @callback
+    def _on_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        self._advertisements.update(
+            service_info.source,
+            service_info.rssi,
+            service_info.device,
+            _device_adapter(service_info.device),
+        )
+        if self.source in (None, service_info.source):
+            self.rssi = service_info.rssi
+            if (
+                self._reported_rssi is None
+                or abs(self.rssi - self._reported_rssi) >= RSSI_HYSTERESIS
+            ):
+                self._reported_rssi = self.rssi
+                self._on_connection_event(EVENT_RSSI)
+        if self.absent:
+            self.absent = False
+            _LOGGER.info("[%s] Seen again", self._name)
+            self._on_availability_changed()
+            for cb in self._reappeared_callbacks:
+                cb()
 
-    def register_connection_callback(self, callback) -> None:
-        self._connection_callbacks.append(callback)
+    def register_reappeared_callback(self, callback) -> None:
+        """Called when an absent device advertises again."""
+        self._reappeared_callbacks.append(callback)
 
-    def _on_connection_event(self) -> None:
-        for callback in self._connection_callbacks:
-            callback()
+    def _check_presence(self):
+        """Fail fast while the device is not heard, the scanners would not find it."""
+        age = self._advertisements.age
+        if self.is_connected or age is None or age < PRESENCE_TIMEOUT:
+            return
+        if not self.absent:
+            self.absent = True
+            _LOGGER.warning(
+                "[%s] Not seen for %.0fs, failing requests until it is back",
+                self._name,
+                age,
+            )
+            self._on_availability_changed()
+        raise DeviceNotSeenError(f"Not seen for {age:.0f}s")
+
+    @property
+    def advertisements(self) -> PathCache:
+        return self._advertisements
+
+    @property
+    def is_connected(self) -> bool:
+        return self._conn is not None and self._conn.is_connected
+
+    def register_availability_callback(self, callback) -> None:
+        """Called when the circuit breaker opens or closes and when the device
+        goes absent or is seen again."""
+        self._availability_callbacks.append(callback)
+
+    def _on_availability_changed(self):
+        for cb in self._availability_callbacks:
+            cb()
+
+    def _record_success(self):
+        if self.breaker.record_success():
+            _LOGGER.info("[%s] Reachable again, circuit closed", self._name)
+            self._on_availability_changed()
+
+    def _record_failure(self) -> bool:
+        """Record a session that failed all its attempts, returns True if the
+        circuit opened."""
+        if not self.breaker.record_failure():
+            return False
+        _LOGGER.warning(
+            "[%s] Circuit opened after %s failed sessions, retrying in %.0fs",
+            self._name,
+            self.breaker.failures,
+            self.breaker.retry_in,
+        )
+        self._on_availability_changed()
+        return True
 
     def shutdown(self):
         _LOGGER.debug(
@@ -76,79 +329,204 @@ class BleakConnection:
         )
         self._terminate_event.set()
         self._notify_event.set()
+        self._cancel_idle_timer()
+        self._cancel_advertisements()
+        if self.is_connected:  # a kept link
+            asyncio.get_running_loop().create_task(self._conn.disconnect())
+        self._release_slot()
+        if self._event_timer is not None:
+            self._event_timer.cancel()
+            self._event_timer = None
+
+    @property
+    def latency(self) -> LatencyEstimator:
+        """Latency estimate of the current path."""
+        source = self.source or "unknown"
+        if (estimator := self._latency.get(source)) is None:
+            estimator = self._latency[source] = LatencyEstimator(
+                self._timeout_floor, self._timeout_ceiling, REQUEST_TIMEOUT
+            )
+        return estimator
+
+    @property
+    def scheduler(self) -> SlotScheduler | None:
+        return self._scheduler
+
+    @property
+    def paths(self) -> PathSelector:
+        return self._paths
+
+    def latency_stats(self) -> dict[str, dict]:
+        """Latency estimates of all paths used so far, for diagnostics."""
+        return {source: e.as_dict() for source, e in self._latency.items()}
+
+    def diagnostics(self) -> dict:
+        """Everything known about the link to the device."""
+        return {
+            "source": self.source,
+            "rssi": self.rssi,
+            "connected": self.is_connected,
+            "absent": self.absent,
+            "requests": {
+                "total": self.requests_total,
+                "coalesced": self.requests_coalesced,
+                "superseded": self.requests_superseded,
+                "deferred": self.requests_deferred,
+                "hedges_started": self.hedges_started,
+                "hedges_won": self.hedges_won,
+                "warm_ups": self.warm_ups,
+            },
+            "metrics": self.metrics.as_dict(),
+            "latency": self.latency_stats(),
+            "breaker": self.breaker.as_dict(),
+            "paths": self._paths.as_dict(),
+            "advertisements": self._advertisements.as_dict(),
+        }
 
     async def throw_if_terminating(self):
         if self._terminate_event.is_set():
             if self._conn:
                 await self._conn.disconnect()
+                self._release_slot()
             raise Exception("Connection cancelled by shutdown")
 
-    async def async_get_connection(self):
-        if self._adapter == Adapter.AUTO:
-            self._ble_device = bluetooth.async_ble_device_from_address(
-                self._hass, self._mac, connectable=True
-            )
-            if self._ble_device == None:
-                raise Exception("Device not found")
-
-            self._conn = await establish_connection(
-                client_class=BleakClient,
-                device=self._ble_device,
-                name=self._name,
-                disconnected_callback=lambda client: self._on_connection_event(),
-                max_attempts=2,
-                use_services_cache=True,
-            )
-        else:
-            device_advertisement_datas = sorted(
-                bluetooth.async_scanner_devices_by_address(
-                    hass=self._hass,
-                    address=self._mac,
-                    connectable=True
+    def _resolve_device(self):
+        """Pick the device and the adapter or proxy to connect through.
+        The paths come from the advertisements, the scanners are only asked
+        when the device was not heard lately."""
+        if self._adapter == Adapter.LOCAL:
+            paths = self._advertisements.fresh() or self._scanner_paths()
+            path = self._rank_paths(paths)[0] if paths else None
+        else:  # auto picks the strongest, an adapter is e.g /org/bluez/hci0
+            adapter = None if self._adapter == Adapter.AUTO else self._adapter
+            path = self._advertisements.best(adapter) or max(
+                (
+                    path
+                    for path in self._scanner_paths()
+                    if adapter is None or path.adapter == adapter
                 ),
-                key=lambda device_advertisement_data: device_advertisement_data.advertisement.rssi
-                or NO_RSSI_VALUE,
-                reverse=True,
-            )
-            if self._adapter == Adapter.LOCAL:
-                if len(device_advertisement_datas) == 0:
-                    raise Exception("Device not found")
-                d_and_a = device_advertisement_datas[
-                    self._round_robin % len(device_advertisement_datas)
-                ]
-            else:  # adapter is e.g /org/bluez/hci0
-                list = [
-                    x
-                    for x in device_advertisement_datas
-                    if (d := x.ble_device.details)
-                    and d.get("props", {}).get("Adapter") == self._adapter
-                ]
-                if len(list) == 0:
-                    raise Exception("Device not found")
-                d_and_a = list[0]
-            self.rssi = d_and_a.advertisement.rssi
-            self._ble_device = d_and_a.ble_device
-            UnwrappedBleakClient = cast(type[BleakClient], BleakClient.__bases__[0])
-            self._conn = UnwrappedBleakClient(
-                self._ble_device,
-                disconnected_callback=lambda client: self._on_connection_event(),
-                dangerous_use_bleak_cache=True,
+                key=lambda path: path.rssi or NO_RSSI,
+                default=None,
             )
-            await self._conn.connect()
+        if path is None:
+            raise Exception("Device not found")
+        self.rssi = path.rssi
+        self._ble_device = path.device
+        self.source = path.source
 
-        self._on_connection_event()
+    def _scanner_paths(self) -> list[CachedPath]:
+        """Paths to the device as known to the scanners."""
+        return [
+            CachedPath(
+                x.scanner.source,
+                x.advertisement.rssi,
+                x.ble_device,
+                _device_adapter(x.ble_device),
+                None,
+            )
+            for x in bluetooth.async_scanner_devices_by_address(
+                hass=self._hass, address=self._mac, connectable=True
+            )
+        ]
 
-        if self._conn.is_connected:
-            _LOGGER.debug("[%s] Connected", self._name)
+    def _rank_paths(self, paths: list[CachedPath]) -> list[CachedPath]:
+        """Sort the paths to the device, best first."""
+        candidates = [(path.source, path.rssi, path) for path in paths]
+        if self._scheduler is not None:
+            ranked = self._paths.rank(candidates, self._scheduler.load)
         else:
-            raise BackendException("Can't connect")
+            ranked = self._paths.rank(candidates)
+        return [candidate[2] for candidate in ranked]
+
+    def _slot(self, source: str, ble_device: BLEDevice):
+        """Connection slot of a source for the duration of a block.
+        A no-op without scheduler."""
+        if self._scheduler is None:
+            return contextlib.nullcontext()
+        return self._scheduler.slot(source, self._mac, _slot_limit(ble_device))
+
+    async def _async_acquire_slot(self):
+        """Take a connection slot of the current source, held until the link
+        is closed. A no-op without scheduler."""
+        if self._scheduler is None:
+            return
+        slots = self._scheduler.source(
+            self.source or "unknown", _slot_limit(self._ble_device)
+        )
+        if self._held_slot is slots:
+            return
+        self._release_slot()
+        await slots.acquire(self._mac)
+        self._held_slot = slots
+
+    def _release_slot(self):
+        if self._held_slot is not None:
+            slots, self._held_slot = self._held_slot, None
+            slots.clear_idle(self._mac)
+            slots.release()
+
+    def _set_idle(self):
+        """Let another device take the slot of the open link while unused."""
+        if self._held_slot is not None and self.is_connected:
+            self._held_slot.set_idle(self._mac, self._reclaim_slot)
+
+    def _reclaim_slot(self):
+        _LOGGER.debug("[%s] Slot needed elsewhere, closing idle link", self._name)
+        self._cancel_idle_timer()
+        asyncio.get_running_loop().create_task(self._async_disconnect_idle())
+
+    async def async_get_connection(self):
+        """Connect to the device picked by _resolve_device, in a slot of its
+        source."""
+        await self._async_acquire_slot()
+        try:
+            if self._adapter == Adapter.AUTO:
+                self._conn = await establish_connection(
+                    client_class=BleakClient,
+                    device=self._ble_device,
+                    name=self._name,
+                    disconnected_callback=self._on_disconnected,
+                    max_attempts=2,
+                    use_services_cache=True,
+                )
+            else:
+                self._conn = _unwrapped_client(
+                    self._ble_device,
+                    disconnected_callback=self._on_disconnected,
+                )
+                await self._conn.connect()
+
+            self._on_connection_event(EVENT_CONNECTED)
+
+            if self._conn.is_connected:
+                _LOGGER.debug("[%s] Connected", self._name)
+            else:
+                raise BackendException("Can't connect")
+        except BaseException:
+            self._release_slot()
+            raise
         return self._conn
 
     async def on_notification(self, handle: BleakGATTCharacteristic, data: bytearray):
         """Handle Callback from a Bluetooth (GATT) request."""
         if PROP_NTFY_UUID == handle.uuid:
-            self._notify_event.set()
+            self._advertisements.seen()
             self._callback(data)
+            request = self._match_response(data)
+            if request is None:
+                _LOGGER.debug(
+                    "[%s] Unsolicited notification %s", self._name, data.hex()
+                )
+                return
+            self._pending.remove(request)
+            if not request.future.done():
+                request.future.set_result(None)
+            if request.sends == 1:  # a resent request's latency is ambiguous
+                self.latency.add_sample(
+                    asyncio.get_running_loop().time() - request.sent_at
+                )
+            if not self._pending:
+                self._notify_event.set()
         else:
             _LOGGER.error(
                 "[%s] wrong charasteristic: %s, %s",
@@ -157,36 +535,353 @@ class BleakConnection:
                 handle.uuid,
             )
 
-    async def async_make_request(self, value, retries=RETRIES):
-        """Write a GATT Command with callback - not utf-8."""
-        async with self._lock:  # only one concurrent request per thermostat
+    def _match_response(self, data: bytearray) -> "_Request | None":
+        """Pop the oldest request waiting for this response, if any."""
+        for size in RESPONSE_PREFIX_SIZES:
+            prefix = bytes(data[:size])
+            if waiters := self._waiting.get(prefix):
+                request = waiters.pop(0)
+                if not waiters:
+                    del self._waiting[prefix]
+                return request
+        return None
+
+    async def async_make_request(self, value, retries=RETRIES, lane=Lane.INTERACTIVE):
+        """Write a GATT Command with callback - not utf-8.
+        Callers of a query that is already queued or in flight share its result
+        instead of issuing another transaction, unless a command was queued
+        after it. Commands are always sent. A caller in a higher priority lane
+        raises the lane of the query it shares."""
+        if value == "ONLY CONNECT":
+            async with self._lock:
+                await self._async_session()
+            return
+        self.requests_total += 1
+        key = _coalesce_key(value)
+        if (request := self._inflight.get(key)) is not None:
+            self.requests_coalesced += 1
+            _LOGGER.debug("[%s] Coalescing request %s", self._name, value.hex())
+            if lane < request.lane:
+                self._promote(request, lane)
+            self._trace_request(request.future, value, lane=lane.name, coalesced=True)
+            return await asyncio.shield(request.future)
+
+        request = self._enqueue(value, retries, lane)
+        self._trace_request(request.future, value, lane=lane.name)
+        if is_idempotent(value):
+            self._inflight[key] = request
+            request.future.add_done_callback(
+                lambda _: self._forget_inflight(key, request)
+            )
+        await asyncio.shield(request.future)
+
+    def _forget_inflight(self, key: bytes, request: "_Request"):
+        if self._inflight.get(key) is request:
+            del self._inflight[key]
+
+    def _promote(self, request: "_Request", lane: Lane):
+        """Serve a request in a higher priority lane."""
+        request.lane = lane
+        if request in self._deferred:  # back into the running session
+            self._deferred.remove(request)
+            self._queue.append(request)
+        if request in self._pending:
+            self._preempt.set()  # retried right away, with a fresh budget
+        else:
+            self._preempt_background()
+
+    async def async_make_batch_request(
+        self,
+        values: list[bytes],
+        retries=RETRIES,
+        lane=Lane.BULK,
+    ):
+        """Write several GATT Commands in one connection session.
+        The batch completes when every command got its response, retries only
+        resend the frames that are still unanswered."""
+        self.requests_total += len(values)
+        futures = [self._enqueue(value, retries, lane).future for value in values]
+        for value, future in zip(values, futures):
+            self._trace_request(future, value, lane=lane.name, batch=len(values))
+        await asyncio.gather(*futures)
+
+    async def async_make_setpoint_request(
+        self, key: str, value: bytes, debounce: float = 0, build=None
+    ):
+        """Write a setpoint, last writer wins.
+        A newer value for the same key replaces one that is still waiting to be
+        sent, unless another command was queued after it. The superseded callers
+        complete together with the final write.
+        The first write of a burst is held back for the debounce window (seconds).
+        If given, build() returns the frame to write when it is sent, so values
+        that are set separately can go out together in one frame."""
+        self.requests_total += 1
+        if (request := self._setpoints.get(key)) is not None:
+            self.requests_superseded += 1
+            _LOGGER.debug(
+                "[%s] Superseding %s: %s -> %s",
+                self._name,
+                key,
+                request.value.hex(),
+                value.hex(),
+            )
+            request.value = value
+            request.build = build
+            self._trace_request(request.future, value, setpoint=key, superseding=True)
+            return await asyncio.shield(request.future)
+
+        request = _Request(value, RETRIES, key, build=build)
+        self._trace_request(request.future, value, setpoint=key)
+        self._setpoints[key] = request
+        if debounce:
+            asyncio.get_running_loop().call_later(
+                debounce, self._enqueue_request, request
+            )
+        else:
+            self._enqueue_request(request)
+        await asyncio.shield(request.future)
+
+    def _trace_request(self, future: asyncio.Future, value: bytes, **tags):
+        """Span from the call to the response or failure, if tracing."""
+        if not self.tracer.enabled:
+            return
+        span = self.tracer.start(
+            "request", mac=self._mac, opcode=f"{value[0]:#04x}", **tags
+        )
+
+        def finish(future: asyncio.Future):
+            span.tag(source=self.source)
+            if future.cancelled():
+                span.finish("cancelled")
+            else:
+                span.finish(_outcome(future.exception()))
+
+        future.add_done_callback(finish)
+
+    def _enqueue(self, value: bytes, retries: int, lane: Lane) -> "_Request":
+        request = _Request(value, retries, lane=lane)
+        self._enqueue_request(request)
+        return request
+
+    def _enqueue_request(self, request: "_Request"):
+        self._queue.append(request)
+        if not is_idempotent(request.value):
+            # queries asked from now on must see the effect of this command
+            self._inflight.clear()
+            # and a newer setpoint must not jump ahead of it
+            for key, queued in list(self._setpoints.items()):
+                if queued is not request and queued in self._queue:
+                    del self._setpoints[key]
+        if request.lane == Lane.INTERACTIVE:
+            self._preempt_background()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._async_drain())
+
+    def _preempt_background(self):
+        """Cut the retries of pending background requests short, a user
+        command is waiting."""
+        if any(pending.lane != Lane.INTERACTIVE for pending in self._pending):
+            self._preempt.set()
+
+    def _dequeue(self) -> list["_Request"]:
+        """Move the queued requests to the pending ones, returns them.
+        User commands are written first."""
+        queued = sorted(self._queue, key=lambda request: request.lane)
+        self._queue = []
+        requests = []
+        for request in queued:
+            # once sent, a setpoint can no longer be replaced
+            if request.key is not None and self._setpoints.get(request.key) is request:
+                del self._setpoints[request.key]
+            if request.build is not None:
+                try:
+                    request.value = request.build()
+                except Exception as ex:
+                    request.future.set_exception(ex)
+                    continue
+            self._waiting.setdefault(request.expect, []).append(request)
+            requests.append(request)
+        self._pending.extend(requests)
+        return requests
+
+    async def _async_drain(self):
+        """Run sessions until the queue is empty."""
+        async with self._lock:  # only one session per thermostat
+            while self._queue:
+                try:
+                    await self._async_session()
+                except Exception:
+                    pass  # already delivered to the waiting callers
+
+    def _defer_background(self):
+        """Set the pending background requests aside until the next session,
+        so a failing poll does not hold up a user command with its retries."""
+        self._preempt.clear()
+        background = [r for r in self._pending if r.lane != Lane.INTERACTIVE]
+        for request in background:
+            self._pending.remove(request)
+            waiters = self._waiting[request.expect]
+            waiters.remove(request)
+            if not waiters:
+                del self._waiting[request.expect]
+        self._deferred.extend(background)
+        self.requests_deferred += len(background)
+        _LOGGER.debug(
+            "[%s] Deferring %s background requests", self._name, len(background)
+        )
+
+    async def _async_backoff(self, delay: float):
+        """Sleep before the next attempt, a user command cuts it short."""
+        try:
+            await asyncio.wait_for(self._preempt.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    @contextlib.contextmanager
+    def _phase(self, phase: str):
+        """Time a phase of the session for the metrics and the trace."""
+        with self.metrics.phase(phase), self.tracer.span(phase):
+            yield
+
+    def _keep_link(self) -> bool:
+        return self._stay_connected or self._idle_timeout > 0
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _schedule_idle_disconnect(self, timeout: float | None = None):
+        """Close an idle link once the idle timeout passed without requests."""
+        self._cancel_idle_timer()
+        timeout = timeout or self._idle_timeout
+        if self._stay_connected or not timeout or not self.is_connected:
+            return
+        loop = asyncio.get_running_loop()
+        self._idle_timer = loop.call_later(
+            timeout,
+            lambda: loop.create_task(self._async_disconnect_idle()),
+        )
+
+    async def _async_disconnect_idle(self):
+        self._idle_timer = None
+        async with self._lock:  # never in the middle of a session
+            if self._queue or not self.is_connected:
+                return
+            _LOGGER.debug("[%s] Idle, disconnecting", self._name)
+            self._subscribed = None
+            await self._conn.disconnect()
+            self._release_slot()
+
+    @property
+    def warm_up_lead(self) -> float:
+        """How long before a planned poll to connect, learned from connect times."""
+        median = self._paths.median_connect_time(
+            self.source or self._paths.last_good or "unknown"
+        )
+        if median is None:
+            return WARM_UP_LEAD
+        return min(WARM_UP_LEAD_MAX, max(WARM_UP_LEAD_MIN, WARM_UP_FACTOR * median))
+
+    async def async_warm_up(self):
+        """Connect ahead of a planned poll, so it does not wait for the connect.
+        Skipped when a session already holds the link, when the device keeps
+        failing or when the path has no free connection slot. The warm link
+        holds its slot until the poll uses it, until it is closed again after
+        twice the lead time or until another device needs the slot."""
+        if self._lock.locked() or self._queue or self.is_connected:
+            return
+        if not self.breaker.is_closed or self.absent:
+            return
+        lead = self.warm_up_lead
+        async with self._lock:
+            if self._queue or self.is_connected:
+                return
             try:
-                await self._async_make_request_try(value, retries)
+                self._resolve_device()
+                if self._scheduler is not None and not self._scheduler.has_free_slot(
+                    self.source or "unknown", _slot_limit(self._ble_device)
+                ):
+                    _LOGGER.debug("[%s] No free slot, skipping warm-up", self._name)
+                    return
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await self.async_get_connection()
+                connect_time = loop.time() - start
+            except Exception as ex:
+                # the poll itself retries as usual
+                _LOGGER.debug("[%s] Warm-up failed: %s", self._name, ex)
+                return
+            self.warm_ups += 1
+            self._paths.record_success(self.source or "unknown", connect_time)
+            self._schedule_idle_disconnect(2 * lead)
+            self._set_idle()
+
+    async def _async_session(self):
+        """Send everything queued over one connection, failing what is not answered."""
+        self._cancel_idle_timer()
+        if self._held_slot is not None:
+            self._held_slot.clear_idle(self._mac)
+        start = asyncio.get_running_loop().time()
+        error = None
+        with self.tracer.span("session", mac=self._mac) as span:
+            try:
+                await self._async_make_request_try()
+            except Exception as ex:
+                error = ex
+                for request in self._pending:
+                    if not request.future.done():
+                        request.future.set_exception(ex)
+                raise
             finally:
+                span.tag(source=self.source, attempts=self.retries)
+                self.metrics.record_session(
+                    _outcome(error),
+                    asyncio.get_running_loop().time() - start,
+                    self.retries,
+                )
+                self._pending = []
+                self._waiting.clear()
+                self._preempt.clear()
+                # deferred requests go first in the next session
+                self._queue[:0] = self._deferred
+                self._deferred = []
                 self.retries = 0
-                self._on_connection_event()
+                self._schedule_idle_disconnect()
+                self._set_idle()
+                self._on_connection_event(EVENT_RETRIES, EVENT_BUSY, EVENT_STATS)
 
-    async def _async_make_request_try(self, value, retries):
+    async def _async_make_request_try(self):
+        self._dequeue()
+        retries = max((request.retries for request in self._pending), default=RETRIES)
+        self._check_presence()
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(
+                f"Circuit open, retrying in {self.breaker.retry_in:.0f}s"
+            )
+        if not self.breaker.is_closed:
+            retries = 1  # half open, a single probe decides
         self.retries = 0
         while True:
             self.retries += 1
-            self._on_connection_event()
+            self._on_connection_event(EVENT_RETRIES, EVENT_BUSY)
+            resolved = False
             try:
-                await self.throw_if_terminating()
-                conn = await self.async_get_connection()
-                self._notify_event.clear()
-                if value != "ONLY CONNECT":
-                    try:
-                        await conn.start_notify(PROP_NTFY_UUID, self.on_notification)
-                        await conn.write_gatt_char(PROP_WRITE_UUID, value, response=True)
-                        await asyncio.wait_for(
-                            self._notify_event.wait(), REQUEST_TIMEOUT
-                        )
-                    finally:
-                        if self._stay_connected:
-                            await conn.stop_notify(PROP_NTFY_UUID)
-                        else:
-                            await conn.disconnect()
+                with self.tracer.span("attempt", attempt=self.retries) as span:
+                    await self.throw_if_terminating()
+                    if not self.is_connected:  # a kept link stays on its path
+                        with self._phase("resolve"):
+                            self._resolve_device()
+                    resolved = True
+                    span.tag(source=self.source)
+                    await self._async_attempt()
+                if self._hedge_answered:  # stalled, prefer the hedge path next time
+                    self._paths.record_failure(self.source or "unknown")
+                else:
+                    self._paths.record_success(
+                        self.source or "unknown", self._connect_time
+                    )
+                self._record_success()
                 return
             except Exception as ex:
                 await self.throw_if_terminating()
@@ -198,7 +893,195 @@ class BleakConnection:
                     ex,
                     exc_info=True,
                 )
-                self._round_robin = self._round_robin + 1
+                if resolved:  # the next attempt will rank this path lower
+                    self._paths.record_failure(self.source or "unknown")
                 if self.retries >= retries:
+                    # one failure per session, transient ones are what retries are for
+                    self._record_failure()
                     raise ex
-                await asyncio.sleep(RETRY_BACK_OFF_FACTOR * self.retries)
+                await self._async_backoff(backoff_delay(self.retries))
+                if self._preempt.is_set():
+                    # retry for the user command alone, with a fresh budget
+                    self._defer_background()
+                    self._dequeue()
+                    if not self._pending:  # it failed to build or is done
+                        return
+                    retries = max(r.retries for r in self._pending)
+                    self.retries = 0
+
+    async def _async_attempt(self):
+        """Connect and exchange the pending requests."""
+        if self.is_connected:
+            conn = self._conn
+            self._connect_time = None
+        else:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            with self._phase("connect"):
+                conn = await self.async_get_connection()
+            self._connect_time = loop.time() - start
+        if not self._pending:
+            return  # ONLY CONNECT
+        self._hedge_answered = False
+        done = False
+        try:
+            if self._subscribed is not conn:
+                with self._phase("start_notify"):
+                    await conn.start_notify(PROP_NTFY_UUID, self.on_notification)
+                self._subscribed = conn
+            # unanswered requests are resent on every retry
+            writes = list(self._pending)
+            while writes:
+                self._notify_event.clear()
+                for request in writes:
+                    with self._phase("write"):
+                        await conn.write_gatt_char(
+                            PROP_WRITE_UUID, request.value, response=True
+                        )
+                    request.sent_at = asyncio.get_running_loop().time()
+                    request.sends += 1
+                try:
+                    with self._phase("notify_wait"):
+                        await self._async_wait_for_responses()
+                except asyncio.TimeoutError:
+                    self.latency.backoff()
+                    raise
+                await self.throw_if_terminating()
+                # keep the session for what was queued meanwhile
+                writes = self._dequeue()
+            done = True
+        finally:
+            # a kept link keeps its subscription too, a link that failed or lost
+            # the race against a hedge is closed
+            if not (done and self._keep_link() and not self._hedge_answered):
+                self._subscribed = None
+                with self._phase("teardown"):
+                    try:
+                        await conn.disconnect()
+                    finally:
+                        self._release_slot()
+
+    async def _async_wait_for_responses(self):
+        """Wait until every pending request is answered.
+        Slow queries are hedged: past the usual latency the unanswered ones are
+        also sent through the next best path and the first answer wins."""
+        timeout = self.latency.timeout
+        delay = self.latency.percentile(HEDGE_PERCENTILE)
+        hedge = self._hedge_path() if delay is not None and delay < timeout else None
+        if hedge is None:
+            await asyncio.wait_for(self._notify_event.wait(), timeout)
+            return
+        try:
+            await asyncio.wait_for(self._notify_event.wait(), delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+        self.hedges_started += 1
+        task = asyncio.get_running_loop().create_task(self._async_hedge(hedge))
+        try:
+            await asyncio.wait_for(self._notify_event.wait(), timeout - delay)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if self._hedge_answered:
+            self.hedges_won += 1
+
+    def _hedge_path(self):
+        """Second best scanner for the pending requests, if they may be hedged."""
+        if not self._hedge or self._adapter not in (Adapter.AUTO, Adapter.LOCAL):
+            return None
+        if not all(is_idempotent(request.value) for request in self._pending):
+            return None
+        paths = self._advertisements.fresh() or self._scanner_paths()
+        others = [path for path in paths if path.source != self.source]
+        return self._rank_paths(others)[0] if others else None
+
+    async def _async_hedge(self, path: CachedPath):
+        """Send the unanswered requests through another path."""
+        source = path.source
+        _LOGGER.debug(
+            "[%s] Hedging %s requests through %s",
+            self._name,
+            len(self._pending),
+            source,
+        )
+        async with self._slot(source, path.device):
+            conn = _unwrapped_client(path.device)
+            try:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await conn.connect()
+                connect_time = loop.time() - start
+                await conn.start_notify(PROP_NTFY_UUID, self._on_hedge_notification)
+                for request in list(self._pending):
+                    await conn.write_gatt_char(
+                        PROP_WRITE_UUID, request.value, response=True
+                    )
+                    request.sends += 1
+                await self._notify_event.wait()
+                self._paths.record_success(source, connect_time)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                _LOGGER.debug(
+                    "[%s] Hedge through %s failed: %s", self._name, source, ex
+                )
+                self._paths.record_failure(source)
+            finally:
+                try:
+                    await conn.disconnect()
+                except Exception:
+                    pass
+
+    async def _on_hedge_notification(
+        self, handle: BleakGATTCharacteristic, data: bytearray
+    ):
+        pending = len(self._pending)
+        await self.on_notification(handle, data)
+        if len(self._pending) < pending:
+            self._hedge_answered = True
+
+
+class _Request:
+    """A frame waiting for its response."""
+
+    __slots__ = (
+        "value",
+        "expect",
+        "retries",
+        "key",
+        "build",
+        "lane",
+        "future",
+        "sent_at",
+        "sends",
+    )
+
+    def __init__(
+        self,
+        value: bytes,
+        retries: int,
+        key: str | None = None,
+        lane: Lane = Lane.INTERACTIVE,
+        build=None,
+    ):
+        self.value = value
+        # a replaced or built setpoint value has the same opcode, so this stays valid
+        self.expect = response_prefix(value)
+        self.retries = retries
+        # setpoint key for last writer wins replacement
+        self.key = key
+        # builds the value when it is sent
+        self.build = build
+        self.lane = lane
+        # loop time of the last write and number of writes, for latency samples
+        self.sent_at = 0.0
+        self.sends = 0
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.future.add_done_callback(_retrieve_exception)
+
+
+def _retrieve_exception(future: asyncio.Future):
+    # callers may have given up waiting, avoid "exception never retrieved" logs
+    if not future.cancelled():
+        future.exception()
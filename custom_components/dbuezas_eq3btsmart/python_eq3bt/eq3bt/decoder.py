@@ -0,0 +1,199 @@
+"""
+Fast-path decoders for the fixed layout notification frames.
+
+The construct definitions in structures.py remain the reference; they are only
+used here for frames whose layout is not one of the well known ones.
+"""
+from datetime import datetime, timedelta
+
+from .structures import PROP_ID_RETURN, PROP_INFO_RETURN, DeviceId, ModeFlags, Status
+
+MODE_MANUAL = 0x01
+MODE_AWAY = 0x02
+MODE_BOOST = 0x04
+MODE_DST = 0x08
+MODE_WINDOW = 0x10
+MODE_LOCKED = 0x20
+MODE_UNKNOWN = 0x40
+MODE_LOW_BATTERY = 0x80
+
+STATUS_LENGTH = 6
+STATUS_AWAY_LENGTH = 10
+STATUS_PRESETS_LENGTH = 15
+DEVICE_ID_LENGTH = 15
+
+# window open time is reported in 5 minute steps, at most 60 minutes
+_WINDOW_OPEN_TIMES = tuple(timedelta(minutes=float(i * 5.0)) for i in range(256))
+
+
+class Record:
+    """Base class for the typed records filled by the decoders."""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class PresetsRecord(Record):
+    """Preset temperatures as reported in the long status frame."""
+
+    __slots__ = (
+        "window_open_temp",
+        "window_open_time",
+        "comfort_temp",
+        "eco_temp",
+        "offset",
+    )
+
+    def __init__(
+        self,
+        window_open_temp: float,
+        window_open_time: timedelta,
+        comfort_temp: float,
+        eco_temp: float,
+        offset: float,
+    ):
+        self.window_open_temp = window_open_temp
+        self.window_open_time = window_open_time
+        self.comfort_temp = comfort_temp
+        self.eco_temp = eco_temp
+        self.offset = offset
+
+
+class StatusRecord(Record):
+    """Decoded status frame. `mode` holds the raw MODE_* flags."""
+
+    __slots__ = ("mode", "valve", "target_temp", "away", "presets")
+
+    def __init__(
+        self,
+        mode: int,
+        valve: int,
+        target_temp: float,
+        away: datetime | None,
+        presets: PresetsRecord | None,
+    ):
+        self.mode = mode
+        self.valve = valve
+        self.target_temp = target_temp
+        self.away = away
+        self.presets = presets
+
+
+class DeviceIdRecord(Record):
+    """Decoded device identification frame."""
+
+    __slots__ = ("version", "serial")
+
+    def __init__(self, version: int, serial: str):
+        self.version = version
+        self.serial = serial
+
+
+def _decode_away(day: int, year: int, hour_min: int, month: int) -> datetime:
+    return datetime(
+        year=year + 2000,
+        month=month,
+        day=day,
+        hour=hour_min >> 1,
+        minute=30 if hour_min & 0x01 else 0,
+    )
+
+
+def _decode_presets(view: memoryview) -> PresetsRecord:
+    return PresetsRecord(
+        window_open_temp=view[10] / 2.0,
+        window_open_time=_WINDOW_OPEN_TIMES[view[11]],
+        comfort_temp=view[12] / 2.0,
+        eco_temp=view[13] / 2.0,
+        offset=(view[14] - 7) / 2.0,
+    )
+
+
+def _fast_decode_status(view: memoryview) -> StatusRecord | None:
+    length = len(view)
+    if (
+        length not in (STATUS_LENGTH, STATUS_AWAY_LENGTH, STATUS_PRESETS_LENGTH)
+        or view[0] != PROP_INFO_RETURN
+        or view[1] != 0x01
+        or view[4] != 0x04
+    ):
+        return None
+    mode = view[2]
+    away = None
+    if mode & MODE_AWAY:
+        if length < STATUS_AWAY_LENGTH:
+            return None
+        away = _decode_away(view[6], view[7], view[8], view[9])
+    presets = None
+    if length == STATUS_PRESETS_LENGTH:
+        presets = _decode_presets(view)
+    return StatusRecord(
+        mode=mode,
+        valve=view[3],
+        target_temp=view[5] / 2.0,
+        away=away,
+        presets=presets,
+    )
+
+
+def status_from_container(parsed) -> StatusRecord:
+    """Convert a construct Status container into a StatusRecord."""
+    presets = None
+    if parsed.presets is not None:
+        presets = PresetsRecord(
+            window_open_temp=parsed.presets.window_open_temp,
+            window_open_time=parsed.presets.window_open_time,
+            comfort_temp=parsed.presets.comfort_temp,
+            eco_temp=parsed.presets.eco_temp,
+            offset=parsed.presets.offset,
+        )
+    return StatusRecord(
+        mode=ModeFlags.build(parsed.mode)[0],
+        valve=parsed.valve,
+        target_temp=parsed.target_temp,
+        away=parsed.away if parsed.mode.AWAY else None,
+        presets=presets,
+    )
+
+
+def decode_status(data: bytes | bytearray | memoryview) -> StatusRecord:
+    """Decode a status frame, falling back to the construct definition."""
+    record = _fast_decode_status(memoryview(data))
+    if record is None:
+        record = status_from_container(Status.parse(bytes(data)))
+    return record
+
+
+def _fast_decode_device_id(view: memoryview) -> DeviceIdRecord | None:
+    if len(view) < DEVICE_ID_LENGTH or view[0] != PROP_ID_RETURN:
+        return None
+    return DeviceIdRecord(
+        version=view[1],
+        serial=bytes(n - 0x30 for n in view[4:14]).decode(),
+    )
+
+
+def device_id_from_container(parsed) -> DeviceIdRecord:
+    """Convert a construct DeviceId container into a DeviceIdRecord."""
+    return DeviceIdRecord(version=parsed.version, serial=parsed.serial)
+
+
+def decode_device_id(data: bytes | bytearray | memoryview) -> DeviceIdRecord:
+    """Decode a device id frame, falling back to the construct definition."""
+    try:
+        record = _fast_decode_device_id(memoryview(data))
+    except (ValueError, UnicodeDecodeError):
+        record = None
+    if record is None:
+        record = device_id_from_container(DeviceId.parse(bytes(data)))
+    return record
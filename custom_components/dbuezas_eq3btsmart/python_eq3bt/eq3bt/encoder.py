@@ -0,0 +1,129 @@
+"""
+Precomputed command frames.
+
+The value space of every setter is tiny (half degree steps, 15 offsets, a
+single mode byte), so all frames are built once at import time and the
+setters only have to index into these tables.
+"""
+from datetime import datetime
+
+from .structures import (
+    PROP_ID_RETURN,
+    PROP_INFO_RETURN,
+    PROP_SCHEDULE_RETURN,
+    PROP_SCHEDULE_SET,
+)
+
+PROP_ID_QUERY = 0
+PROP_INFO_QUERY = 3
+PROP_COMFORT_ECO_CONFIG = 0x11
+PROP_OFFSET = 0x13
+PROP_WINDOW_OPEN_CONFIG = 0x14
+PROP_SCHEDULE_QUERY = 0x20
+
+PROP_MODE_WRITE = 0x40
+PROP_TEMPERATURE_WRITE = 0x41
+PROP_COMFORT = 0x43
+PROP_ECO = 0x44
+PROP_BOOST = 0x45
+PROP_LOCK = 0x80
+
+# temperatures are sent in half degrees, 0x3f is the largest value that
+# does not collide with the mode bits of PROP_MODE_WRITE
+TEMPERATURE_CODES = range(0x40)
+# [-3.5 .. 0  .. 3.5]
+# [00   .. 07 .. 0e ]
+OFFSET_CODES = range(15)
+# window open time in 5 minute steps, [0 .. 60] minutes
+WINDOW_OPEN_TIME_CODES = range(13)
+
+ID_QUERY_FRAME = bytes((PROP_ID_QUERY,))
+COMFORT_FRAME = bytes((PROP_COMFORT,))
+ECO_FRAME = bytes((PROP_ECO,))
+
+SCHEDULE_QUERY_FRAMES = tuple(bytes((PROP_SCHEDULE_QUERY, day)) for day in range(7))
+TEMPERATURE_FRAMES = tuple(
+    bytes((PROP_TEMPERATURE_WRITE, code)) for code in TEMPERATURE_CODES
+)
+MODE_FRAMES = tuple(bytes((PROP_MODE_WRITE, mode)) for mode in range(0x100))
+BOOST_FRAMES = (bytes((PROP_BOOST, 0)), bytes((PROP_BOOST, 1)))
+LOCK_FRAMES = (bytes((PROP_LOCK, 0)), bytes((PROP_LOCK, 1)))
+OFFSET_FRAMES = tuple(bytes((PROP_OFFSET, code)) for code in OFFSET_CODES)
+PRESETS_FRAMES = tuple(
+    tuple(bytes((PROP_COMFORT_ECO_CONFIG, comfort, eco)) for eco in TEMPERATURE_CODES)
+    for comfort in TEMPERATURE_CODES
+)
+WINDOW_OPEN_CONFIG_FRAMES = tuple(
+    tuple(
+        bytes((PROP_WINDOW_OPEN_CONFIG, temp, duration))
+        for duration in WINDOW_OPEN_TIME_CODES
+    )
+    for temp in TEMPERATURE_CODES
+)
+
+# mode byte of PROP_MODE_WRITE, combined with a temperature code
+SET_MODE_AUTO = 0x00
+SET_MODE_MANUAL = 0x40
+SET_MODE_AWAY = 0x80
+
+# prefixes of the notifications answering a frame, every command is answered
+# with a status frame except for the queries and schedule writes
+STATUS_RESPONSE = bytes((PROP_INFO_RETURN, 0x01))
+ID_RESPONSE = bytes((PROP_ID_RETURN,))
+SCHEDULE_RESPONSES = tuple(bytes((PROP_SCHEDULE_RETURN, day)) for day in range(7))
+SCHEDULE_SET_RESPONSES = tuple(bytes((PROP_INFO_RETURN, 0x02, day)) for day in range(7))
+
+# the status query also sets the clock, which is harmless to repeat
+IDEMPOTENT_COMMANDS = frozenset((PROP_ID_QUERY, PROP_INFO_QUERY, PROP_SCHEDULE_QUERY))
+
+
+def response_prefix(frame: bytes) -> bytes:
+    """Return the prefix of the notification that answers a frame."""
+    cmd = frame[0]
+    if cmd == PROP_ID_QUERY:
+        return ID_RESPONSE
+    if cmd == PROP_SCHEDULE_QUERY:
+        return SCHEDULE_RESPONSES[frame[1]]
+    if cmd == PROP_SCHEDULE_SET:
+        return SCHEDULE_SET_RESPONSES[frame[1]]
+    return STATUS_RESPONSE
+
+
+def is_idempotent(frame: bytes) -> bool:
+    """Queries can be sent twice without side effects."""
+    return frame[0] in IDEMPOTENT_COMMANDS
+
+
+def temperature_code(temperature: float) -> int:
+    """Return the half degree code of a temperature."""
+    return int(temperature * 2)
+
+
+def offset_code(offset: float) -> int:
+    """Return the code of a temperature offset."""
+    return int(offset * 2) + 7
+
+
+def info_query_frame(now: datetime) -> bytes:
+    """Status query, it always carries the current time."""
+    return bytes(
+        (
+            PROP_INFO_QUERY,
+            now.year % 100,
+            now.month,
+            now.day,
+            now.hour,
+            now.minute,
+            now.second,
+        )
+    )
+
+
+def away_payload(away_end: datetime) -> bytes:
+    """Encode the away end date, minutes are rounded to h:00 or h:30."""
+    if away_end.year < 2000 or away_end.year > 2099:
+        raise Exception("Invalid year, possible [2000,2099]")
+    hour = away_end.hour * 2
+    if away_end.minute:  # we encode all minute values to h:30
+        hour |= 0x01
+    return bytes((away_end.day, away_end.year - 2000, hour, away_end.month))
@@ -9,34 +9,59 @@ Schedule needs to be requested with query_schedule() before accessing for simila
 
 import codecs
 import logging
-import struct
+import time
 from datetime import datetime, timedelta
 from enum import IntEnum
 
-from construct import Byte
-
 from homeassistant.core import HomeAssistant
-from .structures import AwayDataAdapter, DeviceId, ModeFlags, Schedule, Status
+from .decoder import (
+    MODE_AWAY,
+    MODE_BOOST,
+    MODE_DST,
+    MODE_LOCKED,
+    MODE_LOW_BATTERY,
+    MODE_MANUAL,
+    MODE_WINDOW,
+    DeviceIdRecord,
+    PresetsRecord,
+    StatusRecord,
+    decode_device_id,
+    decode_status,
+)
+from .encoder import (
+    BOOST_FRAMES,
+    COMFORT_FRAME,
+    ECO_FRAME,
+    ID_QUERY_FRAME,
+    LOCK_FRAMES,
+    MODE_FRAMES,
+    OFFSET_FRAMES,
+    PRESETS_FRAMES,
+    SCHEDULE_QUERY_FRAMES,
+    SET_MODE_AUTO,
+    SET_MODE_AWAY,
+    SET_MODE_MANUAL,
+    TEMPERATURE_FRAMES,
+    WINDOW_OPEN_CONFIG_FRAMES,
+    away_payload,
+    info_query_frame,
+    offset_code,
+    temperature_code,
+)
+from .lanes import Lane
+from .latency import DEFAULT_TIMEOUT_CEILING, DEFAULT_TIMEOUT_FLOOR
+from .schedule import DAYS, Hours, WeekSchedule, day_index, encode_program
+from .slots import SlotScheduler
+from .structures import (
+    PROP_ID_RETURN,
+    PROP_INFO_RETURN,
+    PROP_SCHEDULE_RETURN,
+    PROP_SCHEDULE_SET,
+)
+from .tracing import NULL_TRACER, Tracer, traced
 
 _LOGGER = logging.getLogger(__name__)
 
-PROP_ID_QUERY = 0
-PROP_ID_RETURN = 1
-PROP_INFO_QUERY = 3
-PROP_INFO_RETURN = 2
-PROP_COMFORT_ECO_CONFIG = 0x11
-PROP_OFFSET = 0x13
-PROP_WINDOW_OPEN_CONFIG = 0x14
-PROP_SCHEDULE_QUERY = 0x20
-PROP_SCHEDULE_RETURN = 0x21
-
-PROP_MODE_WRITE = 0x40
-PROP_TEMPERATURE_WRITE = 0x41
-PROP_COMFORT = 0x43
-PROP_ECO = 0x44
-PROP_BOOST = 0x45
-PROP_LOCK = 0x80
-
 EQ3BT_AWAY_TEMP = 12.0
 EQ3BT_MIN_TEMP = 5.0
 EQ3BT_MAX_TEMP = 29.5
@@ -45,6 +70,35 @@ EQ3BT_ON_TEMP = 30.0
 EQ3BT_MIN_OFFSET = -3.5
 EQ3BT_MAX_OFFSET = 3.5
 
+# cached day programs older than this are written even if they look identical,
+# they only change through us or the buttons of the valve, see invalidate_schedule
+SCHEDULE_CACHE_MAX_AGE = timedelta(days=30)
+# serial and firmware version are only queried again after this
+DEVICE_DATA_CACHE_MAX_AGE = timedelta(days=7)
+# suggested window to collect setpoint changes (e.g. slider drags) before writing
+SETPOINT_DEBOUNCE = 0.3  # seconds
+
+# properties compared before and after a frame, update callbacks subscribe to
+# these names and to "schedule", "device_data" and "available"
+STATUS_FIELDS = (
+    "target_temperature",
+    "mode",
+    "away",
+    "away_end",
+    "boost",
+    "valve_state",
+    "window_open",
+    "window_open_temperature",
+    "window_open_time",
+    "dst",
+    "locked",
+    "low_battery",
+    "comfort_temperature",
+    "eco_temperature",
+    "temperature_offset",
+)
+DEVICE_DATA_FIELDS = ("firmware_version", "device_serial")
+
 
 class Mode(IntEnum):
     """Thermostat modes."""
@@ -73,16 +127,26 @@ class Thermostat:
         adapter: str,
         stay_connected: bool,
         hass: HomeAssistant,
+        timeout_floor: float = DEFAULT_TIMEOUT_FLOOR,
+        timeout_ceiling: float = DEFAULT_TIMEOUT_CEILING,
+        scheduler: SlotScheduler | None = None,
+        hedge: bool = False,
+        idle_timeout: float = 0,
+        tracer: Tracer = NULL_TRACER,
     ):
         """Initialize the thermostat."""
 
         self.name = name
-        self._status = None
-        self._presets = None
-        self._device_data = None
-        self._schedule = {}
+        self._status: StatusRecord | None = None
+        self._presets: PresetsRecord | None = None
+        self._device_data: DeviceIdRecord | None = None
+        self._device_data_updated: float | None = None
+        self._schedule = WeekSchedule()
         self.default_away_hours: float = 30 * 24
         self.default_away_temp: float = 12
+        # preset temperatures set but not sent yet, by "comfort" and "eco"
+        self._preset_changes: dict[str, float] = {}
+        self.tracer = tracer
 
         from .bleakconnection import BleakConnection
 
@@ -94,14 +158,101 @@ class Thermostat:
             stay_connected=stay_connected,
             hass=hass,
             callback=self.handle_notification,
+            timeout_floor=timeout_floor,
+            timeout_ceiling=timeout_ceiling,
+            scheduler=scheduler,
+            hedge=hedge,
+            idle_timeout=idle_timeout,
+            tracer=tracer,
         )
+        self._conn.register_availability_callback(self._on_availability_changed)
+
+    def register_update_callback(self, on_update, fields=None):
+        """Call on_update() when one of fields changed, any by default.
+        :return: a function that unregisters the callback.
+        """
+        entry = (on_update, None if fields is None else frozenset(fields))
+        self._on_update_callbacks.append(entry)
+
+        def remove():
+            if entry in self._on_update_callbacks:
+                self._on_update_callbacks.remove(entry)
+
+        return remove
 
-    def register_update_callback(self, on_update):
-        self._on_update_callbacks.append(on_update)
+    def _on_changed(self, changed: set[str]):
+        if not changed:
+            return
+        for on_update, fields in list(self._on_update_callbacks):
+            if fields is None or not changed.isdisjoint(fields):
+                on_update()
+
+    def _snapshot(self, fields: tuple) -> dict:
+        return {field: getattr(self, field) for field in fields}
+
+    def _changed_since(self, snapshot: dict) -> set[str]:
+        return {
+            field for field, value in snapshot.items() if getattr(self, field) != value
+        }
+
+    def _on_availability_changed(self):
+        self._on_changed({"available"})
+
+    def register_reappeared_callback(self, on_reappeared):
+        """Called when the device advertises again after being absent."""
+        self._conn.register_reappeared_callback(on_reappeared)
+
+    @property
+    def available(self) -> bool:
+        """False while requests fail fast because the device kept failing
+        or was not heard lately."""
+        return self._conn.breaker.is_closed and not self._conn.absent
 
     def shutdown(self):
         self._conn.shutdown()
 
+    def cache_data(self) -> dict:
+        """Return the slowly changing device data that is worth persisting."""
+        data: dict = {"schedule": self._schedule.as_dict()}
+        if self._device_data is not None:
+            data["device_data"] = {
+                "version": self._device_data.version,
+                "serial": self._device_data.serial,
+                "updated": self._device_data_updated,
+            }
+        return data
+
+    def restore_cache_data(self, data: dict):
+        """Restore data previously returned by cache_data."""
+        if "schedule" in data:
+            self._schedule = WeekSchedule.from_dict(data["schedule"])
+        if "device_data" in data:
+            device_data = data["device_data"]
+            self._device_data = DeviceIdRecord(
+                version=device_data["version"], serial=device_data["serial"]
+            )
+            self._device_data_updated = device_data["updated"]
+
+    def is_device_data_fresh(self) -> bool:
+        """Returns True if serial and firmware are known and not too old."""
+        return (
+            self._device_data_updated is not None
+            and time.time() - self._device_data_updated
+            <= DEVICE_DATA_CACHE_MAX_AGE.total_seconds()
+        )
+
+    def is_schedule_fresh(self) -> bool:
+        """Returns True if no cached day of the schedule is too old."""
+        max_age = SCHEDULE_CACHE_MAX_AGE.total_seconds()
+        return all(self._schedule.is_fresh(day, max_age) for day in self._schedule)
+
+    def invalidate_schedule(self):
+        """Treat the cached schedule as outdated, e.g. after it was changed on
+        the valve. It is fetched again on the next start and no day write is
+        skipped until then."""
+        self._schedule.expire()
+        self._on_changed({"schedule"})
+
     def _verify_temperature(self, temp):
         """Verifies that the temperature is valid.
         :raises TemperatureException: On invalid temperature.
@@ -113,123 +264,154 @@ class Thermostat:
                 )
             )
 
-    def parse_schedule(self, data):
-        """Parses the device sent schedule."""
-        sched = Schedule.parse(data)
-        if sched == None:
-            raise Exception("Parsed empty schedule data")
-        _LOGGER.debug("[%s] Got schedule data for day '%s'", self.name, sched.day)
-
-        return sched
+    def parse_schedule(self, data) -> int:
+        """Stores the device sent schedule, returns the day it belongs to."""
+        day = self._schedule.update_from_frame(data)
+        _LOGGER.debug("[%s] Got schedule data for day '%s'", self.name, DAYS[day])
+        return day
 
     def handle_notification(self, data: bytearray):
         """Handle Callback from a Bluetooth (GATT) request."""
         _LOGGER.debug("[%s] Received notification from the device.", self.name)
-        updated = True
+        changed: set[str] = set()
         if data[0] == PROP_INFO_RETURN and data[1] == 1:
             _LOGGER.debug("[%s] Got status: %s", self.name, codecs.encode(data, "hex"))
-            self._status = Status.parse(data)
-            assert self._status
+            snapshot = self._snapshot(STATUS_FIELDS)
+            self._status = decode_status(data)
             self._presets = self._status.presets
             _LOGGER.debug("[%s] Parsed status: %s", self.name, self._status)
+            changed = self._changed_since(snapshot)
 
         elif data[0] == PROP_SCHEDULE_RETURN:
-            parsed = self.parse_schedule(data)
-            self._schedule[parsed.day] = parsed
+            self.parse_schedule(data)
+            changed = {"schedule"}
 
         elif data[0] == PROP_ID_RETURN:
-            self._device_data = DeviceId.parse(data)
+            snapshot = self._snapshot(DEVICE_DATA_FIELDS)
+            self._device_data = decode_device_id(data)
+            self._device_data_updated = time.time()
             _LOGGER.debug("[%s] Parsed device data: %s", self.name, self._device_data)
+            # the fetch time changed even if the data did not
+            changed = self._changed_since(snapshot) | {"device_data"}
 
         else:
-            updated = False
             _LOGGER.debug(
                 "[%s] Unknown notification %s (%s)",
                 self.name,
                 data[0],
                 codecs.encode(data, "hex"),
             )
-        if updated:
-            for callback in self._on_update_callbacks:
-                callback()
+        self._on_changed(changed)
 
+    @traced("query_id")
     async def async_query_id(self):
         """Query device identification information, e.g. the serial number."""
         _LOGGER.debug("[%s] Querying id..", self.name)
-        value = struct.pack("B", PROP_ID_QUERY)
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_request(ID_QUERY_FRAME, lane=Lane.BULK)
         _LOGGER.debug("[%s] Finished Querying id..", self.name)
 
-    async def async_update(self):
+    @property
+    def warm_up_lead(self) -> float:
+        """Seconds before a planned poll to call async_warm_up."""
+        return self._conn.warm_up_lead
+
+    async def async_warm_up(self):
+        """Open the connection ahead of a planned poll, if it is worth it."""
+        await self._conn.async_warm_up()
+
+    @traced("update")
+    async def async_update(self, lane: Lane = Lane.POLL):
         """Update the data from the thermostat. Always sets the current time."""
         _LOGGER.debug("[%s] Querying the device..", self.name)
-        time = datetime.now()
-        value = struct.pack(
-            "BBBBBBB",
-            PROP_INFO_QUERY,
-            time.year % 100,
-            time.month,
-            time.day,
-            time.hour,
-            time.minute,
-            time.second,
-        )
-
-        await self._conn.async_make_request(value)
+        value = info_query_frame(datetime.now())
+        await self._conn.async_make_request(value, lane=lane)
 
     async def async_query_schedule(self, day):
         _LOGGER.debug("[%s] Querying schedule..", self.name)
 
         if day < 0 or day > 6:
             _LOGGER.error("[%s] Invalid day: %s", self.name, day)
+            return
 
-        value = struct.pack("BB", PROP_SCHEDULE_QUERY, day)
+        await self._conn.async_make_request(SCHEDULE_QUERY_FRAMES[day], lane=Lane.BULK)
 
-        await self._conn.async_make_request(value)
+    @traced("query_week")
+    async def async_query_week(self):
+        """Query the schedule of all days in a single connection session."""
+        _LOGGER.debug("[%s] Querying week schedule..", self.name)
+        await self._conn.async_make_batch_request(
+            [SCHEDULE_QUERY_FRAMES[day] for day in range(len(DAYS))], lane=Lane.BULK
+        )
 
     @property
-    def schedule(self):
+    def schedule(self) -> WeekSchedule:
         """Returns previously fetched schedule.
-        :return: Schedule structure or None if not fetched.
+        :return: WeekSchedule holding the days fetched so far.
         """
         return self._schedule
 
-    async def async_set_schedule(self, day, hours):
+    @traced("set_schedule")
+    async def async_set_schedule(self, day, hours: Hours):
+        """Sets the schedule for the given day.
+        :param hours: (target_temp, next_change_at) pairs, None meaning 24:00.
+        """
         _LOGGER.debug(
             "[%s] Setting schedule day=[%s], hours=[%s]", self.name, day, hours
         )
-
-        """Sets the schedule for the given day."""
-        data = Schedule.build(
-            {
-                "cmd": "write",
-                "day": day,
-                "hours": hours,
-            }
-        )
+        await self._async_write_schedule(day_index(day), encode_program(hours))
+        self._on_changed({"schedule"})
+
+    @traced("set_schedules")
+    async def async_set_schedules(self, days, hours: Hours) -> int:
+        """Sets the same schedule for several days.
+        Days whose cached program is fresh and identical are not written.
+        :return: the number of elided writes.
+        """
+        program = encode_program(hours)
+        max_age = SCHEDULE_CACHE_MAX_AGE.total_seconds()
+        elided = 0
+        try:
+            for day in map(day_index, days):
+                if (
+                    self._schedule.is_fresh(day, max_age)
+                    and self._schedule.program(day) == program
+                ):
+                    _LOGGER.debug(
+                        "[%s] Schedule for '%s' unchanged", self.name, DAYS[day]
+                    )
+                    elided += 1
+                    continue
+                await self._async_write_schedule(day, program)
+        finally:
+            self._on_changed({"schedule"})
+        return elided
+
+    async def _async_write_schedule(self, day: int, program: bytes):
+        # the device state is unknown until the write is confirmed
+        self._schedule.forget(day)
+        data = bytes((PROP_SCHEDULE_SET, day)) + program
         await self._conn.async_make_request(data)
-
-        parsed = self.parse_schedule(data)
-        self._schedule[parsed.day] = parsed
-        for callback in self._on_update_callbacks:
-            callback()
+        self.parse_schedule(data)
 
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
         return self._status.target_temp if self._status else -1
 
-    async def async_set_target_temperature(self, temperature):
-        """Set new target temperature."""
-        dev_temp = int(temperature * 2)
+    @traced("set_target_temperature")
+    async def async_set_target_temperature(self, temperature, debounce: float = 0):
+        """Set new target temperature.
+        Replaces a target temperature that has not been sent yet."""
+        dev_temp = temperature_code(temperature)
         if temperature == EQ3BT_OFF_TEMP or temperature == EQ3BT_ON_TEMP:
-            dev_temp |= 0x40
-            value = struct.pack("BB", PROP_MODE_WRITE, dev_temp)
+            value = MODE_FRAMES[SET_MODE_MANUAL | dev_temp]
         else:
             self._verify_temperature(temperature)
-            value = struct.pack("BB", PROP_TEMPERATURE_WRITE, dev_temp)
+            value = TEMPERATURE_FRAMES[dev_temp]
 
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_setpoint_request(
+            "target_temperature", value, debounce
+        )
 
     @property
     def mode(self):
@@ -240,10 +422,11 @@ class Thermostat:
             return Mode.Off
         if self.target_temperature == EQ3BT_ON_TEMP:
             return Mode.On
-        if self._status.mode.MANUAL:
+        if self._status.mode & MODE_MANUAL:
             return Mode.Manual
         return Mode.Auto
 
+    @traced("set_mode")
     async def async_set_mode(self, mode):
         """Set the operation mode."""
         _LOGGER.debug("[%s] Setting new mode: %s", self.name, mode)
@@ -253,22 +436,25 @@ class Thermostat:
         if mode == Mode.On:
             return await self.async_set_target_temperature(EQ3BT_ON_TEMP)
         if mode == Mode.Auto:
-            return await self._async_set_mode(0)
+            return await self._async_set_mode(SET_MODE_AUTO)
         if mode == Mode.Manual:
             temperature = max(
                 min(self.target_temperature, EQ3BT_MAX_TEMP), EQ3BT_MIN_TEMP
             )
-            return await self._async_set_mode(0x40 | int(temperature * 2))
+            return await self._async_set_mode(
+                SET_MODE_MANUAL | temperature_code(temperature)
+            )
 
     @property
     def away(self) -> bool | None:
         """Returns True if the thermostat is in boost mode."""
-        return self._status and self._status.mode.AWAY  # type: ignore
+        return self._status and bool(self._status.mode & MODE_AWAY)
 
     @property
     def away_end(self) -> datetime | None:
         return self._status and self._status.away  # type: ignore
 
+    @traced("set_away_until")
     async def async_set_away_until(self, away_end: datetime, temperature: float):
         """Sets away mode with default temperature."""
 
@@ -279,23 +465,23 @@ class Thermostat:
         _LOGGER.debug(
             "[%s] Setting away until %s, temp %s", self.name, away_end, temperature
         )
-        adapter = AwayDataAdapter(Byte[4])  # type: ignore
-        packed = adapter.build(away_end)
-
-        await self._async_set_mode(0x80 | int(temperature * 2), packed)
+        await self._async_set_mode(
+            SET_MODE_AWAY | temperature_code(temperature), away_payload(away_end)
+        )
 
+    @traced("set_away")
     async def async_set_away(self, away: bool):
         """Sets away mode with default temperature."""
         if not away:
             _LOGGER.debug("[%s] Disabling away, going to auto mode.", self.name)
-            return await self._async_set_mode(0x00)
+            return await self._async_set_mode(SET_MODE_AUTO)
 
         away_end = datetime.now() + timedelta(hours=self.default_away_hours)
 
         await self.async_set_away_until(away_end, self.default_away_temp)
 
     async def _async_set_mode(self, mode, payload=None):
-        value = struct.pack("BB", PROP_MODE_WRITE, mode)
+        value = MODE_FRAMES[mode]
         if payload:
             value += payload
         await self._conn.async_make_request(value)
@@ -303,13 +489,13 @@ class Thermostat:
     @property
     def boost(self) -> bool | None:
         """Returns True if the thermostat is in boost mode."""
-        return self._status and self._status.mode.BOOST  # type: ignore
+        return self._status and bool(self._status.mode & MODE_BOOST)
 
+    @traced("set_boost")
     async def async_set_boost(self, boost):
         """Sets boost mode."""
         _LOGGER.debug("[%s] Setting boost mode: %s", self.name, boost)
-        value = struct.pack("BB", PROP_BOOST, bool(boost))
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_request(BOOST_FRAMES[bool(boost)])
 
     @property
     def valve_state(self) -> int | None:
@@ -320,8 +506,9 @@ class Thermostat:
     def window_open(self) -> bool | None:
         """Returns True if the thermostat reports a open window
         (detected by sudden drop of temperature)"""
-        return self._status and self._status.mode.WINDOW  # type: ignore
+        return self._status and bool(self._status.mode & MODE_WINDOW)
 
+    @traced("window_open_config")
     async def async_window_open_config(self, temperature, duration):
         """Configures the window open behavior. The duration is specified in
         5 minute increments."""
@@ -332,15 +519,12 @@ class Thermostat:
             duration,
         )
         self._verify_temperature(temperature)
-        if duration.seconds < 0 and duration.seconds > 3600:
+        if duration.seconds < 0 or duration.seconds > 3600:
             raise ValueError
 
-        value = struct.pack(
-            "BBB",
-            PROP_WINDOW_OPEN_CONFIG,
-            int(temperature * 2),
-            int(duration.seconds / 300),
-        )
+        value = WINDOW_OPEN_CONFIG_FRAMES[temperature_code(temperature)][
+            int(duration.seconds / 300)
+        ]
         await self._conn.async_make_request(value)
 
     @property
@@ -356,39 +540,59 @@ class Thermostat:
     @property
     def dst(self) -> bool | None:
         """Returns True if the thermostat is in Daylight Saving Time."""
-        return self._status and self._status.mode.DST  # type: ignore
+        return self._status and bool(self._status.mode & MODE_DST)
 
     @property
     def locked(self) -> bool | None:
         """Returns True if the thermostat is locked."""
-        return self._status and self._status.mode.LOCKED  # type: ignore
+        return self._status and bool(self._status.mode & MODE_LOCKED)
 
+    @traced("set_locked")
     async def async_set_locked(self, lock):
         """Locks or unlocks the thermostat."""
         _LOGGER.debug("[%s] Setting the lock: %s", self.name, lock)
-        value = struct.pack("BB", PROP_LOCK, bool(lock))
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_request(LOCK_FRAMES[bool(lock)])
 
     @property
     def low_battery(self) -> bool | None:
         """Returns True if the thermostat reports a low battery."""
-        return self._status and self._status.mode.LOW_BATTERY  # type: ignore
+        return self._status and bool(self._status.mode & MODE_LOW_BATTERY)
 
-    async def async_temperature_presets(self, comfort, eco):
+    @traced("temperature_presets")
+    async def async_temperature_presets(
+        self, comfort=None, eco=None, debounce: float = 0
+    ):
         """Set the thermostats preset temperatures comfort (sun) and
-        eco (moon)."""
+        eco (moon), None keeps the current one. Values that have not been sent
+        yet are merged, the frame is built from the latest of both when sent."""
         _LOGGER.debug(
             "[%s] Setting temperature presets, comfort: %s eco: %s",
             self.name,
             comfort,
             eco,
         )
-        self._verify_temperature(comfort)
-        self._verify_temperature(eco)
-        value = struct.pack(
-            "BBB", PROP_COMFORT_ECO_CONFIG, int(comfort * 2), int(eco * 2)
+        changes = {}
+        for name, temperature in (("comfort", comfort), ("eco", eco)):
+            if temperature is not None:
+                self._verify_temperature(temperature)
+                changes[name] = temperature
+        value = self._presets_frame({**self._preset_changes, **changes})
+        self._preset_changes.update(changes)
+        await self._conn.async_make_setpoint_request(
+            "presets", value, debounce, build=self._take_presets_frame
         )
-        await self._conn.async_make_request(value)
+
+    def _presets_frame(self, changes: dict) -> bytes:
+        comfort = changes.get("comfort", self.comfort_temperature)
+        eco = changes.get("eco", self.eco_temperature)
+        if comfort is None or eco is None:
+            raise TemperatureException("Presets are not known yet, update first")
+        return PRESETS_FRAMES[temperature_code(comfort)][temperature_code(eco)]
+
+    def _take_presets_frame(self) -> bytes:
+        # called when the presets are sent, later changes need another write
+        changes, self._preset_changes = self._preset_changes, {}
+        return self._presets_frame(changes)
 
     @property
     def comfort_temperature(self):
@@ -405,32 +609,29 @@ class Thermostat:
         """Returns the thermostat's temperature offset."""
         return self._presets and self._presets.offset
 
-    async def async_set_temperature_offset(self, offset):
-        """Sets the thermostat's temperature offset."""
+    @traced("set_temperature_offset")
+    async def async_set_temperature_offset(self, offset, debounce: float = 0):
+        """Sets the thermostat's temperature offset.
+        Replaces an offset that has not been sent yet."""
         _LOGGER.debug("[%s] Setting offset: %s", self.name, offset)
         # [-3,5 .. 0  .. 3,5 ]
         # [00   .. 07 .. 0e ]
         if offset < EQ3BT_MIN_OFFSET or offset > EQ3BT_MAX_OFFSET:
             raise TemperatureException("Invalid value: %s" % offset)
 
-        current = -3.5
-        values = {}
-        for i in range(15):
-            values[current] = i
-            current += 0.5
-
-        value = struct.pack("BB", PROP_OFFSET, values[offset])
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_setpoint_request(
+            "offset", OFFSET_FRAMES[offset_code(offset)], debounce
+        )
 
+    @traced("activate_comfort")
     async def async_activate_comfort(self):
         """Activates the comfort temperature."""
-        value = struct.pack("B", PROP_COMFORT)
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_request(COMFORT_FRAME)
 
+    @traced("activate_eco")
     async def async_activate_eco(self):
         """Activates the comfort temperature."""
-        value = struct.pack("B", PROP_ECO)
-        await self._conn.async_make_request(value)
+        await self._conn.async_make_request(ECO_FRAME)
 
     @property
     def firmware_version(self) -> str | None:
@@ -0,0 +1,15 @@
+"""
+Priority lanes of the requests to a device.
+
+Within a device, requests are served by lane: user commands go before
+background polls, which go before bulk jobs like schedule fetches.
+"""
+from enum import IntEnum
+
+
+class Lane(IntEnum):
+    """Priority of a request to a device, lower is served first."""
+
+    INTERACTIVE = 0
+    POLL = 1
+    BULK = 2
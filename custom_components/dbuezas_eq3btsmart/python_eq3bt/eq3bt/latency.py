@@ -0,0 +1,90 @@
+"""
+Response latency estimation.
+
+Works like the TCP retransmission timer (RFC 6298): a smoothed round trip
+time and its mean deviation are updated with every answered request, the
+timeout is the smoothed value plus four deviations, clamped to a floor and
+a ceiling.
+"""
+from collections import deque
+
+ALPHA = 1 / 8  # gain of the smoothed round trip time
+BETA = 1 / 4  # gain of the round trip time variation
+K = 4
+
+# seconds, a local adapter answers within ~200ms, a weak proxy within ~4s
+DEFAULT_TIMEOUT_FLOOR = 1.0
+DEFAULT_TIMEOUT_CEILING = 10.0
+# smallest floor accepted, lower values are raised to it
+TIMEOUT_FLOOR_MIN = 0.1
+# recent samples kept for percentiles
+WINDOW = 32
+
+
+class LatencyEstimator:
+    """Rolling latency estimate of one path to a device, in seconds."""
+
+    __slots__ = (
+        "srtt",
+        "rttvar",
+        "samples",
+        "timeouts",
+        "floor",
+        "ceiling",
+        "_rto",
+        "_window",
+    )
+
+    def __init__(self, floor: float, ceiling: float, initial: float):
+        if not 0 < floor <= ceiling:
+            raise ValueError(f"Invalid timeout range: {floor} - {ceiling}")
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.samples = 0
+        self.timeouts = 0
+        self._rto = self._clamp(initial)
+        self._window: deque[float] = deque(maxlen=WINDOW)
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.floor), self.ceiling)
+
+    @property
+    def timeout(self) -> float:
+        """Time to wait for a response before giving up."""
+        return self._rto
+
+    def add_sample(self, rtt: float):
+        """Update the estimate with the latency of an answered request.
+        Only requests sent exactly once may be sampled (Karn's algorithm)."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.samples += 1
+        self._window.append(rtt)
+        self._rto = self._clamp(self.srtt + K * self.rttvar)
+
+    def percentile(self, q: float) -> float | None:
+        """Latency below which a fraction q of the recent samples fall."""
+        if not self._window:
+            return None
+        ordered = sorted(self._window)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def backoff(self):
+        """Double the timeout after a request timed out."""
+        self.timeouts += 1
+        self._rto = self._clamp(self._rto * 2)
+
+    def as_dict(self) -> dict:
+        return {
+            "srtt": self.srtt,
+            "rttvar": self.rttvar,
+            "timeout": self._rto,
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,100 @@
+"""
+Request metrics: per-phase timings, outcomes and retry counts.
+
+Every connection session is split in phases (resolve, connect, start_notify,
+write, notify_wait and teardown). Their durations go to fixed bucket
+histograms, so memory stays bounded no matter how long Home Assistant runs.
+This tells a valve that is slow to connect from one that is slow to answer.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+
+PHASES = ("resolve", "connect", "start_notify", "write", "notify_wait", "teardown")
+
+# upper bounds of the histogram buckets, the last bucket takes the rest
+TIME_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)  # seconds
+RETRY_BUCKETS = (1, 2, 3, 5, 8, 14)
+
+
+class Histogram:
+    """Counts of values by bucket, plus their sum, min and max."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "min", "max")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q quantile, None if unbounded."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound:g}" for bound in self.buckets]
+        labels.append(f">{self.buckets[-1]:g}")
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else None,
+            "min": None if self.min is None else round(self.min, 3),
+            "max": None if self.max is None else round(self.max, 3),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class RequestMetrics:
+    """Phase timings, outcomes and retries of the sessions of one device."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.phases = {phase: Histogram(TIME_BUCKETS) for phase in PHASES}
+        self.sessions = Histogram(TIME_BUCKETS)
+        self.retries = Histogram(RETRY_BUCKETS)
+        self.outcomes: dict[str, int] = {}
+
+    def record_phase(self, phase: str, seconds: float):
+        self.phases[phase].add(seconds)
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Time the block as phase, whether it succeeds or not."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, self._clock() - start)
+
+    def record_session(self, outcome: str, seconds: float, attempts: int):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.sessions.add(seconds)
+        if attempts:
+            self.retries.add(attempts)
+
+    def as_dict(self) -> dict:
+        return {
+            "outcomes": dict(self.outcomes),
+            "sessions": self.sessions.as_dict(),
+            "attempts": self.retries.as_dict(),
+            "phases": {name: h.as_dict() for name, h in self.phases.items()},
+        }
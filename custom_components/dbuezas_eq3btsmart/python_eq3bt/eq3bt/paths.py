@@ -0,0 +1,189 @@
+"""
+Scored selection of the adapter or proxy to connect through.
+
+Every path (scanner source) keeps a smoothed success rate and its recent
+connect times. Candidates are ranked by success rate, median connect time,
+RSSI and the number of connections the scanner is already busy with. The
+path that worked last gets a bonus that decays over time, so it is tried
+first but a clearly better path is given a chance now and then.
+
+The paths a device can currently be reached through are kept in a cache that
+is fed by its advertisements, so finding them needs no scanner lookup.
+"""
+from collections import deque
+import statistics
+import time
+
+SUCCESS_ALPHA = 0.3  # weight of the latest attempt in the success rate
+SUCCESS_PRIOR = 0.75  # success rate of a path that was never tried
+CONNECT_SAMPLES = 16
+
+# score weights
+SUCCESS_WEIGHT = 100  # per 100% success rate
+LATENCY_WEIGHT = 10  # per second of median connect time
+RSSI_WEIGHT = 0.5  # per dBm
+LOAD_WEIGHT = 10  # per connection already held or queued on the scanner
+STICKY_BONUS = 30
+STICKY_HALF_LIFE = 600.0  # seconds
+
+NO_RSSI = -127
+
+# advertisements older than this no longer count as a path to the device
+PATH_MAX_AGE = 180.0  # seconds
+
+
+class PathStats:
+    """Track record of a single path."""
+
+    __slots__ = ("success_rate", "attempts", "failures", "connect_times")
+
+    def __init__(self):
+        self.success_rate = SUCCESS_PRIOR
+        self.attempts = 0
+        self.failures = 0
+        self.connect_times: deque[float] = deque(maxlen=CONNECT_SAMPLES)
+
+    @property
+    def median_connect_time(self) -> float | None:
+        if not self.connect_times:
+            return None
+        return statistics.median(self.connect_times)
+
+    def record(self, success: bool, connect_time: float | None = None):
+        self.attempts += 1
+        if not success:
+            self.failures += 1
+        self.success_rate += SUCCESS_ALPHA * (success - self.success_rate)
+        if connect_time is not None:
+            self.connect_times.append(connect_time)
+
+    def as_dict(self) -> dict:
+        median = self.median_connect_time
+        return {
+            "success_rate": round(self.success_rate, 3),
+            "attempts": self.attempts,
+            "failures": self.failures,
+            "median_connect_time": None if median is None else round(median, 3),
+        }
+
+
+class PathSelector:
+    """Ranks the paths to one device."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._stats: dict[str, PathStats] = {}
+        self.last_good: str | None = None
+        self._last_good_since = 0.0
+
+    def stats(self, source: str) -> PathStats:
+        if (stats := self._stats.get(source)) is None:
+            stats = self._stats[source] = PathStats()
+        return stats
+
+    def median_connect_time(self, source: str) -> float | None:
+        if (stats := self._stats.get(source)) is None:
+            return None
+        return stats.median_connect_time
+
+    def score(self, source: str, rssi: int | None, load: int = 0) -> float:
+        stats = self._stats.get(source)
+        success_rate = SUCCESS_PRIOR if stats is None else stats.success_rate
+        median = None if stats is None else stats.median_connect_time
+        score = SUCCESS_WEIGHT * success_rate
+        score += RSSI_WEIGHT * (NO_RSSI if rssi is None else rssi)
+        score -= LOAD_WEIGHT * load
+        if median is not None:
+            score -= LATENCY_WEIGHT * median
+        if source == self.last_good:
+            age = self._clock() - self._last_good_since
+            score += STICKY_BONUS * 0.5 ** (age / STICKY_HALF_LIFE)
+        return score
+
+    def rank(self, candidates, load=lambda source: 0) -> list:
+        """Sort (source, rssi, ...) tuples best first."""
+        return sorted(
+            candidates,
+            key=lambda c: self.score(c[0], c[1], load(c[0])),
+            reverse=True,
+        )
+
+    def record_success(self, source: str, connect_time: float):
+        self.stats(source).record(True, connect_time)
+        if source != self.last_good:
+            self.last_good = source
+            self._last_good_since = self._clock()
+
+    def record_failure(self, source: str):
+        self.stats(source).record(False)
+        if source == self.last_good:
+            self.last_good = None
+
+    def as_dict(self) -> dict:
+        return {
+            "last_good": self.last_good,
+            "paths": {source: s.as_dict() for source, s in self._stats.items()},
+        }
+
+
+class CachedPath:
+    """The latest advertisement of a device heard through one source."""
+
+    __slots__ = ("source", "rssi", "device", "adapter", "last_seen")
+
+    def __init__(self, source: str, rssi: int | None, device, adapter, last_seen):
+        self.source = source
+        self.rssi = rssi
+        # the BLEDevice to connect to and the local adapter path, if any
+        self.device = device
+        self.adapter = adapter
+        self.last_seen = last_seen
+
+
+class PathCache:
+    """Where a device was heard lately, by adapter or proxy."""
+
+    def __init__(self, max_age: float = PATH_MAX_AGE, clock=time.monotonic):
+        self._max_age = max_age
+        self._clock = clock
+        self._paths: dict[str, CachedPath] = {}
+        self.last_seen: float | None = None
+
+    def update(self, source: str, rssi: int | None, device, adapter=None):
+        now = self._clock()
+        if (path := self._paths.get(source)) is None:
+            self._paths[source] = CachedPath(source, rssi, device, adapter, now)
+        else:
+            path.rssi, path.device, path.adapter = rssi, device, adapter
+            path.last_seen = now
+        self.last_seen = now
+
+    def seen(self):
+        """The device was heard some other way, e.g. over a connection."""
+        self.last_seen = self._clock()
+
+    def fresh(self) -> list[CachedPath]:
+        """Paths heard within the maximum age."""
+        oldest = self._clock() - self._max_age
+        return [path for path in self._paths.values() if path.last_seen >= oldest]
+
+    def best(self, adapter=None) -> CachedPath | None:
+        """Strongest fresh path, through the given local adapter if any."""
+        paths = [
+            path for path in self.fresh() if adapter is None or path.adapter == adapter
+        ]
+        return max(paths, key=lambda path: path.rssi or NO_RSSI, default=None)
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the device was last heard through any path."""
+        if self.last_seen is None:
+            return None
+        return self._clock() - self.last_seen
+
+    def as_dict(self) -> dict:
+        now = self._clock()
+        return {
+            source: {"rssi": path.rssi, "age": round(now - path.last_seen, 1)}
+            for source, path in self._paths.items()
+        }
@@ -0,0 +1,107 @@
+"""
+Retry policy: jittered exponential backoff and a circuit breaker.
+
+The breaker counts consecutive failed sessions, each of which already used
+up its retries, so transient connect errors do not count. Once it opens,
+requests fail immediately instead of retrying against a device that is out
+of range or out of battery. After a cool down a single probe is let through
+(half open), its outcome closes the breaker or opens it for longer.
+"""
+from enum import Enum
+import random
+import time
+
+BACKOFF_BASE = 0.25  # seconds
+BACKOFF_CAP = 5.0  # seconds
+
+FAILURE_THRESHOLD = 3  # failed sessions
+RESET_TIMEOUT = 30.0  # seconds
+RESET_TIMEOUT_MAX = 600.0  # seconds
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE,
+    cap: float = BACKOFF_CAP,
+    rand=random.random,
+) -> float:
+    """Delay before retry number attempt (1 based), with full jitter."""
+    return rand() * min(cap, base * 2 ** (attempt - 1))
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker of a single device."""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        reset_timeout_max: float = RESET_TIMEOUT_MAX,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._reset_timeout_max = reset_timeout_max
+        self._clock = clock
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened = 0  # times the breaker opened
+        self._open_until = 0.0
+        self._cool_down = reset_timeout
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == BreakerState.CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed, 0 if not open."""
+        if self.state != BreakerState.OPEN:
+            return 0.0
+        return max(self._open_until - self._clock(), 0.0)
+
+    def allow_request(self) -> bool:
+        """Return True if a connection attempt may be made now.
+        An open breaker turns half open once its cool down has passed, the
+        caller then owns the probe and must record its outcome."""
+        if self.state == BreakerState.OPEN:
+            if self._clock() < self._open_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> bool:
+        """Record a success, returns True if the breaker closed."""
+        self.failures = 0
+        self._cool_down = self._reset_timeout
+        if self.state == BreakerState.CLOSED:
+            return False
+        self.state = BreakerState.CLOSED
+        return True
+
+    def record_failure(self) -> bool:
+        """Record a failure, returns True if the breaker opened."""
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN:
+            # the probe failed, stay away for longer
+            self._cool_down = min(self._cool_down * 2, self._reset_timeout_max)
+        elif self.state == BreakerState.OPEN or self.failures < self.failure_threshold:
+            return False
+        self.state = BreakerState.OPEN
+        self.opened += 1
+        self._open_until = self._clock() + self._cool_down
+        return True
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "opened": self.opened,
+            "retry_in": round(self.retry_in, 1),
+        }
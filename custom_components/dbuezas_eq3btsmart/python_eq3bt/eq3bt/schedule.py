@@ -0,0 +1,230 @@
+"""
+Compact weekly schedule model.
+
+The device sends and receives a day program as up to seven
+(temperature, next change) byte pairs. The whole week is kept in a single
+98 byte buffer in exactly that wire format, so storing, comparing and
+encoding a schedule never builds intermediate objects.
+"""
+from array import array
+from datetime import time
+from time import time as now
+
+from .structures import NAME_TO_DAY, PROP_SCHEDULE_RETURN, PROP_SCHEDULE_SET
+
+DAYS = tuple(sorted(NAME_TO_DAY, key=NAME_TO_DAY.__getitem__))
+SLOTS_PER_DAY = 7
+DAY_SIZE = 2 * SLOTS_PER_DAY
+WEEK_SIZE = len(DAYS) * DAY_SIZE
+# times are sent in 10 minute steps, 24:00 marks the last slot of the day
+END_OF_DAY = 24 * 6
+ALL_DAYS = (1 << len(DAYS)) - 1
+
+Hours = list[tuple[float, time | None]]
+
+
+def day_index(day: int | str) -> int:
+    """Return the device day index for a day name (sat, sun, mon ...) or index."""
+    if isinstance(day, str):
+        return NAME_TO_DAY[day]
+    if not 0 <= day < len(DAYS):
+        raise ValueError(f"Invalid day: {day}")
+    return day
+
+
+def encode_program(hours: Hours) -> bytes:
+    """Encode a day program. A next change of None means until 24:00."""
+    if not 0 < len(hours) <= SLOTS_PER_DAY:
+        raise ValueError(f"A day program has 1 to {SLOTS_PER_DAY} entries")
+    program = bytearray(DAY_SIZE)
+    for i, (target_temp, next_change_at) in enumerate(hours):
+        program[2 * i] = int(target_temp * 2)
+        if next_change_at is None:
+            program[2 * i + 1] = END_OF_DAY
+        else:
+            program[2 * i + 1] = (
+                next_change_at.hour * 60 + next_change_at.minute
+            ) // 10
+    return bytes(program)
+
+
+def decode_program(program: bytes | bytearray | memoryview) -> Hours:
+    """Decode a day program up to and including the 24:00 entry."""
+    hours: Hours = []
+    for i in range(0, len(program), 2):
+        target_temp = program[i] / 2.0
+        code = program[i + 1]
+        if code >= END_OF_DAY:
+            hours.append((target_temp, None))
+            break
+        hours.append((target_temp, time(*divmod(code * 10, 60))))
+    return hours
+
+
+class WeekSchedule:
+    """Weekly schedule stored as the concatenated day programs."""
+
+    __slots__ = ("_data", "_known", "_updated", "_attributes")
+
+    def __init__(
+        self,
+        data: bytes | None = None,
+        known: int = 0,
+        updated: list[float] | None = None,
+    ):
+        self._data = bytearray(data) if data is not None else bytearray(WEEK_SIZE)
+        if len(self._data) != WEEK_SIZE:
+            raise ValueError(f"Schedule data must be {WEEK_SIZE} bytes")
+        # bit mask of the days whose program is known
+        self._known = known
+        # unix timestamp of the last time each day was read or written
+        self._updated = array("d", updated or [0.0] * len(DAYS))
+        self._attributes: dict | None = None
+
+    def __eq__(self, other):
+        if not isinstance(other, WeekSchedule):
+            return NotImplemented
+        return self._known == other._known and self._data == other._data
+
+    def __repr__(self):
+        return f"WeekSchedule({bytes(self._data).hex()}, known={self._known:#09b})"
+
+    def __len__(self):
+        return bin(self._known).count("1")
+
+    def __contains__(self, day) -> bool:
+        return bool(self._known & (1 << day_index(day)))
+
+    def __iter__(self):
+        return (day for day in range(len(DAYS)) if self._known & (1 << day))
+
+    def copy(self) -> "WeekSchedule":
+        return WeekSchedule(bytes(self._data), self._known, list(self._updated))
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return {
+            "data": self._data.hex(),
+            "known": self._known,
+            "updated": list(self._updated),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WeekSchedule":
+        return cls(bytes.fromhex(data["data"]), data["known"], data["updated"])
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._data)
+
+    @property
+    def known(self) -> int:
+        return self._known
+
+    def updated_at(self, day: int | str) -> float | None:
+        """Return when the program of a day was last read or written."""
+        day = day_index(day)
+        if not self._known & (1 << day):
+            return None
+        return self._updated[day]
+
+    def is_fresh(self, day: int | str, max_age: float) -> bool:
+        """Return True if the day is known and younger than max_age seconds."""
+        updated = self.updated_at(day)
+        return updated is not None and now() - updated <= max_age
+
+    def expire(self):
+        """Keep the programs but treat them as outdated."""
+        self._updated = array("d", [0.0] * len(DAYS))
+
+    def forget(self, day: int | str):
+        """Mark the program of a day as unknown."""
+        day = day_index(day)
+        start = day * DAY_SIZE
+        self._data[start : start + DAY_SIZE] = bytes(DAY_SIZE)
+        self._known &= ~(1 << day)
+        self._updated[day] = 0.0
+        self._attributes = None
+
+    def program(self, day: int | str) -> bytes | None:
+        """Return the raw program of a day or None if it is not known."""
+        day = day_index(day)
+        if not self._known & (1 << day):
+            return None
+        return bytes(self._data[day * DAY_SIZE : (day + 1) * DAY_SIZE])
+
+    def hours(self, day: int | str) -> Hours | None:
+        """Return the decoded program of a day or None if it is not known."""
+        day = day_index(day)
+        if not self._known & (1 << day):
+            return None
+        return decode_program(
+            memoryview(self._data)[day * DAY_SIZE : (day + 1) * DAY_SIZE]
+        )
+
+    def set_program(
+        self,
+        day: int | str,
+        program: bytes | bytearray | memoryview,
+        updated: float | None = None,
+    ):
+        day = day_index(day)
+        if len(program) > DAY_SIZE or len(program) % 2:
+            raise ValueError(f"Invalid day program length: {len(program)}")
+        start = day * DAY_SIZE
+        self._data[start : start + len(program)] = program
+        self._data[start + len(program) : start + DAY_SIZE] = bytes(
+            DAY_SIZE - len(program)
+        )
+        self._known |= 1 << day
+        self._updated[day] = now() if updated is None else updated
+        self._attributes = None
+
+    def update_from_frame(self, frame: bytes | bytearray) -> int:
+        """Store the program of a PROP_SCHEDULE_* frame, returns its day."""
+        if len(frame) < 2 or frame[0] not in (PROP_SCHEDULE_RETURN, PROP_SCHEDULE_SET):
+            raise ValueError(f"Not a schedule frame: {bytes(frame).hex()}")
+        day = day_index(frame[1])
+        self.set_program(day, memoryview(frame)[2:])
+        return day
+
+    def frame(self, day: int | str, cmd: int = PROP_SCHEDULE_SET) -> bytes:
+        """Return the frame that writes the program of a day."""
+        day = day_index(day)
+        program = self.program(day)
+        if program is None:
+            raise ValueError(f"Schedule for {DAYS[day]} is not known")
+        return bytes((cmd, day)) + program
+
+    def diff(self, other: "WeekSchedule") -> list[int]:
+        """Return the known days whose program is missing or different in other."""
+        changed = []
+        for day in self:
+            start = day * DAY_SIZE
+            if not other._known & (1 << day) or (
+                self._data[start : start + DAY_SIZE]
+                != other._data[start : start + DAY_SIZE]
+            ):
+                changed.append(day)
+        return changed
+
+    def as_attributes(self) -> dict:
+        """Render the schedule as state attributes, cached until it changes."""
+        if self._attributes is None:
+            attributes = {}
+            for day in self:
+                name = DAYS[day]
+                day_nice: dict = {"day": name}
+                for i, (target_temp, next_change_at) in enumerate(self.hours(day)):
+                    day_nice[f"target_temp_{i}"] = target_temp
+                    if next_change_at is None:
+                        break
+                    day_nice[f"next_change_at_{i}"] = next_change_at.isoformat()
+                attributes[name] = day_nice
+            self._attributes = attributes
+        return self._attributes
+
+
+def encode_frame(day: int | str, hours: Hours) -> bytes:
+    """Return the PROP_SCHEDULE_SET frame for a day program."""
+    return bytes((PROP_SCHEDULE_SET, day_index(day))) + encode_program(hours)
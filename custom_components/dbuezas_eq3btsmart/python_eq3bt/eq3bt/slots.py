@@ -0,0 +1,153 @@
+"""
+Connection slot scheduler shared by all thermostats.
+
+Adapters and proxies can only hold a few connections at once (an ESPHome
+proxy typically 3, a local adapter 5 to 7). Every connection takes a slot
+of the source it goes through and holds it until it is closed. When all
+slots are taken, devices queue and are served round robin, so one device
+retrying cannot starve the others, and links kept open while idle are asked
+to give their slot back.
+"""
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Callable
+
+PROXY_SLOTS = 3
+LOCAL_ADAPTER_SLOTS = 5
+
+
+class SourceSlots:
+    """Slots and wait queue of a single adapter or proxy."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        # waiting futures by device, the first device is served next
+        self._waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        # reclaim callbacks of the idle holders, the oldest is asked first
+        self._idle: OrderedDict[str, Callable[[], None]] = OrderedDict()
+        self.reclaimed = 0
+        self.acquired = 0
+        self.max_queue_depth = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @property
+    def free(self) -> int:
+        """Slots that can be taken right away."""
+        if self._waiters:
+            return 0
+        return max(0, self.limit - self.active)
+
+    async def acquire(self, device: str):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if self.active >= self.limit or self._waiters:
+            future = loop.create_future()
+            self._waiters.setdefault(device, deque()).append(future)
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            self._reclaim()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()  # granted while being cancelled
+                else:
+                    self._remove(device, future)
+                raise
+        else:
+            self.active += 1
+        waited = loop.time() - start
+        self.acquired += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def release(self):
+        self.active -= 1
+        while self._waiters and self.active < self.limit:
+            device, waiters = self._waiters.popitem(last=False)
+            future = waiters.popleft()
+            if waiters:  # back of the line for its next request
+                self._waiters[device] = waiters
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    def set_idle(self, device: str, reclaim: Callable[[], None]):
+        """The link of device is open but unused, reclaim() closes it when
+        another device needs the slot."""
+        self._idle[device] = reclaim
+        if self._waiters:
+            self._reclaim()
+
+    def clear_idle(self, device: str):
+        self._idle.pop(device, None)
+
+    def _reclaim(self):
+        if self._idle:
+            _, reclaim = self._idle.popitem(last=False)
+            self.reclaimed += 1
+            reclaim()
+
+    def _remove(self, device: str, future: asyncio.Future):
+        waiters = self._waiters.get(device)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self._waiters[device]
+
+    def as_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "idle": len(self._idle),
+            "reclaimed": self.reclaimed,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "wait_avg": self.wait_total / self.acquired if self.acquired else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+class SlotScheduler:
+    """Connection slots of every adapter and proxy, by source."""
+
+    def __init__(self):
+        self._sources: dict[str, SourceSlots] = {}
+
+    def source(self, source: str, limit: int = PROXY_SLOTS) -> SourceSlots:
+        if (slots := self._sources.get(source)) is None:
+            slots = self._sources[source] = SourceSlots(limit)
+        return slots
+
+    def load(self, source: str) -> int:
+        """Connections held or waited for on a source."""
+        if (slots := self._sources.get(source)) is None:
+            return 0
+        return slots.active + slots.queue_depth
+
+    def has_free_slot(self, source: str, limit: int = PROXY_SLOTS) -> bool:
+        """True if a connection through source would not have to wait."""
+        if (slots := self._sources.get(source)) is None:
+            return limit > 0
+        return slots.free > 0
+
+    @asynccontextmanager
+    async def slot(self, source: str, device: str, limit: int = PROXY_SLOTS):
+        """Hold a connection slot of source for the duration of the block.
+        The limit only applies when the source is seen for the first time."""
+        slots = self.source(source, limit)
+        await slots.acquire(device)
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def as_dict(self) -> dict:
+        return {source: slots.as_dict() for source, slots in self._sources.items()}
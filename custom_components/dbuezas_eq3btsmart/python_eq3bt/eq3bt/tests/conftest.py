@@ -0,0 +1,68 @@
+import importlib
+import sys
+from types import ModuleType
+
+import pytest
+
+
+def _stub_missing(name: str, **attrs):
+    """Stand in for a module of Home Assistant or bleak that is not installed.
+    The connection only needs their names at import time, the tests patch
+    what is called."""
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = sys.modules[name] = ModuleType(name)
+        module.__dict__.update(attrs)
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, module)
+
+
+def _missing(name: str) -> type:
+    return type(name, (), {})
+
+
+async def _establish_connection(*args, **kwargs):
+    raise NotImplementedError("patched by the tests")
+
+
+_stub_missing("bleak", BleakClient=_missing("BleakClient"))
+_stub_missing("bleak.backends")
+_stub_missing(
+    "bleak.backends.characteristic",
+    BleakGATTCharacteristic=_missing("BleakGATTCharacteristic"),
+)
+_stub_missing("bleak.backends.device", BLEDevice=_missing("BLEDevice"))
+_stub_missing("bleak_retry_connector", establish_connection=_establish_connection)
+_stub_missing("homeassistant")
+_stub_missing(
+    "homeassistant.core",
+    HomeAssistant=_missing("HomeAssistant"),
+    callback=lambda func: func,
+)
+_stub_missing("homeassistant.components")
+_stub_missing(
+    "homeassistant.components.bluetooth",
+    BluetoothServiceInfoBleak=_missing("BluetoothServiceInfoBleak"),
+    BluetoothChange=_missing("BluetoothChange"),
+)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when now is set."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(request):
+    """A FakeClock, also set as self.clock on unittest test cases."""
+    clock = FakeClock()
+    if request.instance is not None:
+        request.instance.clock = clock
+    return clock
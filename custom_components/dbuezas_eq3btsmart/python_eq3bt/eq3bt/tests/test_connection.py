@@ -0,0 +1,456 @@
+"""
+Behavior of the request pipeline of BleakConnection against a fake thermostat.
+
+Home Assistant and bleak are stubbed by conftest.py when not installed.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+from eq3bt import Adapter, bleakconnection, encoder, eq3btsmart, lanes, slots
+
+BleakConnection = bleakconnection.BleakConnection
+Lane = lanes.Lane
+
+MAC = "00:1A:22:00:00:01"
+STATUS = bytes.fromhex("020100000428")
+# comfort 20, eco 17
+STATUS_WITH_PRESETS = bytes.fromhex("020100000422000000001803282207")
+ID = bytes.fromhex("01780000807581626163606067659e")
+STATUS_QUERY = bytes.fromhex("0317010203040506")
+BOOST_ON, BOOST_OFF = encoder.BOOST_FRAMES[1], encoder.BOOST_FRAMES[0]
+LOCK_ON = encoder.LOCK_FRAMES[1]
+
+
+def answer(frame: bytes) -> bytes:
+    """The notification a thermostat sends back for a frame."""
+    if frame[0] == encoder.PROP_ID_QUERY:
+        return ID
+    if frame[0] == encoder.PROP_SCHEDULE_QUERY:
+        return bytes((0x21, frame[1])) + bytes(26)
+    if frame[0] == 0x10:  # schedule write
+        return bytes((0x02, 0x02, frame[1]))
+    return STATUS
+
+
+class FakeThermostat:
+    """The radio side: connects, answers every write and can be told to fail."""
+
+    def __init__(self):
+        self.writes: list[bytes] = []
+        self.connects = 0
+        self.connect_failures = 0  # number of next connects that fail
+        self.delay = lambda frame: 0.0  # before the answer to a frame
+        self.client: "FakeClient | None" = None
+
+    async def establish_connection(
+        self, client_class, device, name, disconnected_callback, **kwargs
+    ):
+        await asyncio.sleep(0)
+        if self.connect_failures:
+            self.connect_failures -= 1
+            raise Exception("connect failed")
+        self.connects += 1
+        self.client = FakeClient(self, disconnected_callback)
+        return self.client
+
+
+class FakeClient:
+    """Stands in for BleakClient."""
+
+    def __init__(self, thermostat: FakeThermostat, disconnected_callback):
+        self._thermostat = thermostat
+        self._disconnected_callback = disconnected_callback
+        self._on_notification = None
+        self.is_connected = True
+
+    async def start_notify(self, uuid, callback):
+        self._on_notification = callback
+
+    async def write_gatt_char(self, uuid, data, response=True):
+        frame = bytes(data)
+        self._thermostat.writes.append(frame)
+        loop = asyncio.get_running_loop()
+        handle = SimpleNamespace(uuid=bleakconnection.PROP_NTFY_UUID, handle=0x421)
+        loop.call_later(
+            self._thermostat.delay(frame),
+            lambda: loop.create_task(
+                self._on_notification(handle, bytearray(answer(frame)))
+            ),
+        )
+
+    async def disconnect(self):
+        if self.is_connected:
+            self.is_connected = False
+            self._disconnected_callback(self)
+
+
+def advertisement(source="proxy", rssi=-60):
+    device = SimpleNamespace(address=MAC, details={})
+    return SimpleNamespace(source=source, rssi=rssi, device=device)
+
+
+class ConnectionTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.thermostat = FakeThermostat()
+        self.notifications: list[bytes] = []
+        for name, value in (
+            ("bluetooth", MagicMock()),
+            ("establish_connection", self.thermostat.establish_connection),
+            ("backoff_delay", lambda attempt: 0.0),
+        ):
+            patcher = patch.object(bleakconnection, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def connect(self, mac=MAC, **kwargs) -> BleakConnection:
+        conn = BleakConnection(
+            mac,
+            "test",
+            Adapter.AUTO,
+            False,
+            None,
+            lambda data: self.notifications.append(bytes(data)),
+            **kwargs,
+        )
+        conn._on_advertisement(advertisement(), None)
+        self.addAsyncCleanup(self.shutdown, conn)
+        return conn
+
+    async def shutdown(self, conn: BleakConnection):
+        conn.shutdown()
+        await asyncio.sleep(0)  # let a kept link disconnect
+
+
+class TestQueue(ConnectionTestCase):
+    async def test_drains_in_one_session(self):
+        conn = self.connect()
+        await asyncio.gather(
+            conn.async_make_request(STATUS_QUERY, lane=Lane.POLL),
+            conn.async_make_request(encoder.ID_QUERY_FRAME, lane=Lane.BULK),
+            conn.async_make_request(BOOST_ON),
+            conn.async_make_request(LOCK_ON),
+        )
+        self.assertEqual(self.thermostat.connects, 1)
+        # user commands first, then the poll, then bulk jobs
+        self.assertEqual(
+            self.thermostat.writes,
+            [BOOST_ON, LOCK_ON, STATUS_QUERY, encoder.ID_QUERY_FRAME],
+        )
+        self.assertFalse(conn.is_connected)
+
+    async def test_queued_meanwhile_joins_the_session(self):
+        conn = self.connect()
+        self.thermostat.delay = lambda frame: 0.05
+        first = asyncio.create_task(conn.async_make_request(BOOST_ON))
+        await asyncio.sleep(0.01)  # sent, not answered yet
+        await asyncio.gather(first, conn.async_make_request(LOCK_ON))
+        self.assertEqual(self.thermostat.connects, 1)
+        self.assertEqual(self.thermostat.writes, [BOOST_ON, LOCK_ON])
+
+    async def test_failure_reaches_every_caller(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 100
+        results = await asyncio.gather(
+            conn.async_make_request(BOOST_ON, retries=2),
+            conn.async_make_request(LOCK_ON, retries=2),
+            return_exceptions=True,
+        )
+        self.assertTrue(all(isinstance(r, Exception) for r in results))
+        self.assertEqual(self.thermostat.writes, [])
+
+    async def test_zero_timeout_floor_is_raised(self):
+        conn = self.connect(timeout_floor=0, timeout_ceiling=0)
+        await asyncio.wait_for(conn.async_make_request(BOOST_ON), 1)
+        self.assertGreater(conn.latency.timeout, 0)
+
+
+class TestBreaker(ConnectionTestCase):
+    async def test_transient_failures_do_not_open_it(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 5
+        await conn.async_make_request(BOOST_ON)
+        self.assertEqual(self.thermostat.writes, [BOOST_ON])
+        self.assertTrue(conn.breaker.is_closed)
+        self.assertEqual(conn.breaker.failures, 0)
+
+    async def test_counts_failed_sessions(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 100
+        for _ in range(conn.breaker.failure_threshold - 1):
+            with self.assertRaises(Exception):
+                await conn.async_make_request(BOOST_ON, retries=3)
+        self.assertTrue(conn.breaker.is_closed)
+        with self.assertRaises(Exception):
+            await conn.async_make_request(BOOST_ON, retries=3)
+        self.assertFalse(conn.breaker.is_closed)
+        remaining = self.thermostat.connect_failures
+        with self.assertRaises(bleakconnection.CircuitOpenError):
+            await conn.async_make_request(BOOST_ON)
+        # failed right away, without trying to connect
+        self.assertEqual(self.thermostat.connect_failures, remaining)
+
+
+class TestSlots(ConnectionTestCase):
+    async def test_kept_link_holds_its_slot(self):
+        scheduler = slots.SlotScheduler()
+        conn = self.connect(scheduler=scheduler, idle_timeout=60)
+        await conn.async_make_request(BOOST_ON)
+        self.assertTrue(conn.is_connected)
+        self.assertEqual(scheduler.source("proxy").active, 1)
+        await self.shutdown(conn)
+        self.assertFalse(conn.is_connected)
+        self.assertEqual(scheduler.source("proxy").active, 0)
+
+    async def test_dropped_link_gives_its_slot_back(self):
+        scheduler = slots.SlotScheduler()
+        conn = self.connect(scheduler=scheduler, idle_timeout=60)
+        await conn.async_make_request(BOOST_ON)
+        await self.thermostat.client.disconnect()
+        self.assertEqual(scheduler.source("proxy").active, 0)
+
+    async def test_closed_link_gives_its_slot_back(self):
+        scheduler = slots.SlotScheduler()
+        conn = self.connect(scheduler=scheduler)
+        await conn.async_make_request(BOOST_ON)
+        await asyncio.sleep(0.01)  # answered before the teardown
+        self.assertFalse(conn.is_connected)
+        self.assertEqual(scheduler.source("proxy").active, 0)
+
+    async def test_idle_link_is_reclaimed(self):
+        scheduler = slots.SlotScheduler()
+        scheduler.source("proxy", limit=1)
+        idle = self.connect(scheduler=scheduler, idle_timeout=60)
+        await idle.async_make_request(BOOST_ON)
+        other = self.connect(mac="00:1A:22:00:00:02", scheduler=scheduler)
+        await asyncio.wait_for(other.async_make_request(LOCK_ON), 1)
+        self.assertFalse(idle.is_connected)
+        self.assertEqual(self.thermostat.writes, [BOOST_ON, LOCK_ON])
+        self.assertEqual(scheduler.source("proxy").reclaimed, 1)
+
+
+class TestWarmUp(ConnectionTestCase):
+    async def test_warm_link_holds_its_slot_until_used(self):
+        scheduler = slots.SlotScheduler()
+        conn = self.connect(scheduler=scheduler)
+        await conn.async_warm_up()
+        self.assertTrue(conn.is_connected)
+        self.assertEqual(scheduler.source("proxy").as_dict()["active"], 1)
+        await conn.async_make_request(STATUS_QUERY, lane=Lane.POLL)
+        await asyncio.sleep(0.01)  # answered before the teardown
+        self.assertEqual(self.thermostat.connects, 1)
+        self.assertFalse(conn.is_connected)
+        self.assertEqual(scheduler.source("proxy").active, 0)
+
+    async def test_warm_link_gives_its_slot_to_a_user_command(self):
+        scheduler = slots.SlotScheduler()
+        scheduler.source("proxy", limit=1)
+        warm = self.connect(scheduler=scheduler)
+        await warm.async_warm_up()
+        other = self.connect(mac="00:1A:22:00:00:02", scheduler=scheduler)
+        await asyncio.wait_for(other.async_make_request(BOOST_ON), 1)
+        self.assertFalse(warm.is_connected)
+
+    async def test_skipped_without_a_free_slot(self):
+        scheduler = slots.SlotScheduler()
+        scheduler.source("proxy", limit=1)
+        await scheduler.source("proxy").acquire("other")
+        conn = self.connect(scheduler=scheduler)
+        await conn.async_warm_up()
+        self.assertEqual(self.thermostat.connects, 0)
+        self.assertEqual(conn.warm_ups, 0)
+
+
+class TestRssi(ConnectionTestCase):
+    async def test_reported_past_the_hysteresis(self):
+        conn = self.connect()  # first seen at -60
+        with patch.object(conn, "_on_connection_event") as event:
+            for rssi in (-61, -62, -59, -58, -63, -57):
+                conn._on_advertisement(advertisement(rssi=rssi), None)
+        self.assertEqual(conn.rssi, -57)
+        self.assertEqual(
+            event.call_args_list,
+            [((bleakconnection.EVENT_RSSI,),), ((bleakconnection.EVENT_RSSI,),)],
+        )
+
+
+class TestBatch(ConnectionTestCase):
+    async def test_matches_responses_by_prefix(self):
+        conn = self.connect()
+        # answered in reverse order, each one completes its own query
+        self.thermostat.delay = lambda frame: (7 - frame[1]) * 0.005
+        await conn.async_make_batch_request(list(encoder.SCHEDULE_QUERY_FRAMES))
+        self.assertEqual(self.thermostat.connects, 1)
+        self.assertEqual(self.thermostat.writes, list(encoder.SCHEDULE_QUERY_FRAMES))
+        self.assertEqual([n[1] for n in self.notifications], list(range(6, -1, -1)))
+
+    async def test_retry_resends_only_the_unanswered(self):
+        conn = self.connect(timeout_floor=0.05, timeout_ceiling=0.05)
+        lost = {encoder.SCHEDULE_QUERY_FRAMES[3]}
+
+        def delay(frame):
+            if frame in lost:  # the first answer to day 3 is lost
+                lost.discard(frame)
+                return 10.0
+            return 0.0
+
+        self.thermostat.delay = delay
+        await conn.async_make_batch_request(list(encoder.SCHEDULE_QUERY_FRAMES))
+        self.assertEqual(self.thermostat.connects, 2)
+        self.assertEqual(
+            self.thermostat.writes,
+            [*encoder.SCHEDULE_QUERY_FRAMES, encoder.SCHEDULE_QUERY_FRAMES[3]],
+        )
+
+
+class TestCoalescing(ConnectionTestCase):
+    async def test_identical_queries_share_one_write(self):
+        conn = self.connect()
+        other_query = bytes.fromhex("0317010203040507")  # another clock time
+        await asyncio.gather(
+            conn.async_make_request(STATUS_QUERY),
+            conn.async_make_request(other_query),
+            conn.async_make_request(encoder.ID_QUERY_FRAME),
+            conn.async_make_request(encoder.ID_QUERY_FRAME),
+        )
+        self.assertEqual(self.thermostat.writes, [STATUS_QUERY, encoder.ID_QUERY_FRAME])
+        self.assertEqual(conn.requests_coalesced, 2)
+
+    async def test_commands_are_never_merged(self):
+        conn = self.connect()
+        # the first one is still in flight when the last one is made
+        self.thermostat.delay = lambda frame: 0.2
+        calls = []
+        for frame in (BOOST_ON, BOOST_OFF, BOOST_ON):
+            calls.append(asyncio.create_task(conn.async_make_request(frame)))
+            await asyncio.sleep(0.05)
+        await asyncio.gather(*calls)
+        self.assertEqual(self.thermostat.writes, [BOOST_ON, BOOST_OFF, BOOST_ON])
+        self.assertEqual(conn.requests_coalesced, 0)
+
+    async def test_query_is_not_merged_across_a_command(self):
+        conn = self.connect()
+        self.thermostat.delay = lambda frame: 0.05
+        before = asyncio.create_task(conn.async_make_request(STATUS_QUERY))
+        await asyncio.sleep(0.01)
+        command = asyncio.create_task(conn.async_make_request(BOOST_ON))
+        await asyncio.sleep(0)
+        await asyncio.gather(before, command, conn.async_make_request(STATUS_QUERY))
+        self.assertEqual(self.thermostat.writes, [STATUS_QUERY, BOOST_ON, STATUS_QUERY])
+
+
+class TestSetpoints(ConnectionTestCase):
+    async def test_last_writer_wins(self):
+        conn = self.connect()
+        frames = [encoder.TEMPERATURE_FRAMES[code] for code in (40, 41, 42)]
+        await asyncio.gather(
+            *(
+                conn.async_make_setpoint_request("target_temperature", f, 0.02)
+                for f in frames
+            )
+        )
+        self.assertEqual(self.thermostat.writes, [frames[-1]])
+        self.assertEqual(conn.requests_superseded, 2)
+
+    async def test_sent_setpoint_is_not_replaced(self):
+        conn = self.connect()
+        first = asyncio.create_task(
+            conn.async_make_setpoint_request("offset", encoder.OFFSET_FRAMES[7])
+        )
+        await asyncio.sleep(0.01)  # sent
+        await asyncio.gather(
+            first,
+            conn.async_make_setpoint_request("offset", encoder.OFFSET_FRAMES[9]),
+        )
+        self.assertEqual(
+            self.thermostat.writes,
+            [encoder.OFFSET_FRAMES[7], encoder.OFFSET_FRAMES[9]],
+        )
+
+    async def test_not_replaced_across_a_command(self):
+        conn = self.connect()
+        temperatures = encoder.TEMPERATURE_FRAMES
+        auto = encoder.MODE_FRAMES[encoder.SET_MODE_AUTO]
+        await asyncio.gather(
+            conn.async_make_setpoint_request("target_temperature", temperatures[40]),
+            conn.async_make_request(auto),
+            conn.async_make_setpoint_request("target_temperature", temperatures[44]),
+        )
+        # 22 degrees is held, it is not overridden by the earlier mode change
+        self.assertEqual(
+            self.thermostat.writes, [temperatures[40], auto, temperatures[44]]
+        )
+        self.assertEqual(conn.requests_superseded, 0)
+
+
+class TestPresets(ConnectionTestCase):
+    def thermostat_device(self):
+        device = eq3btsmart.Thermostat(MAC, "test", Adapter.AUTO, False, None)
+        device._conn._on_advertisement(advertisement(), None)
+        self.addCleanup(device.shutdown)
+        return device
+
+    async def test_comfort_and_eco_set_separately_go_out_together(self):
+        device = self.thermostat_device()
+        device.handle_notification(bytearray(STATUS_WITH_PRESETS))
+        await asyncio.gather(
+            device.async_temperature_presets(comfort=22, debounce=0.05),
+            device.async_temperature_presets(eco=16, debounce=0.05),
+        )
+        self.assertEqual(self.thermostat.writes, [bytes.fromhex("112c20")])
+
+    async def test_unknown_presets(self):
+        device = self.thermostat_device()
+        with self.assertRaises(eq3btsmart.TemperatureException):
+            await device.async_temperature_presets(comfort=22)
+        self.assertEqual(self.thermostat.writes, [])
+
+
+class TestLanes(ConnectionTestCase):
+    async def test_user_command_preempts_a_failing_poll(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 1
+        with patch.object(bleakconnection, "backoff_delay", lambda attempt: 10):
+            poll = asyncio.create_task(
+                conn.async_make_request(STATUS_QUERY, lane=Lane.POLL)
+            )
+            await asyncio.sleep(0.01)  # first connect failed, backing off
+            # served without waiting for the backoff of the poll
+            await asyncio.wait_for(conn.async_make_request(BOOST_ON), 1)
+            # the poll follows in the next session
+            await asyncio.wait_for(poll, 1)
+        self.assertEqual(self.thermostat.writes, [BOOST_ON, STATUS_QUERY])
+        self.assertEqual(conn.requests_deferred, 1)
+
+    async def test_preempting_request_that_fails_to_build(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 1
+
+        def build():
+            raise eq3btsmart.TemperatureException("no presets")
+
+        with patch.object(bleakconnection, "backoff_delay", lambda attempt: 0.05):
+            poll = asyncio.create_task(
+                conn.async_make_request(STATUS_QUERY, lane=Lane.POLL)
+            )
+            await asyncio.sleep(0.01)  # first connect failed, backing off
+            with self.assertRaises(eq3btsmart.TemperatureException):
+                await conn.async_make_setpoint_request("presets", BOOST_ON, build=build)
+            await asyncio.wait_for(poll, 1)
+        self.assertEqual(self.thermostat.writes, [STATUS_QUERY])
+        self.assertNotIn("error", conn.metrics.as_dict()["outcomes"])
+
+    async def test_coalesced_user_query_promotes_the_poll(self):
+        conn = self.connect()
+        self.thermostat.connect_failures = 1
+        with patch.object(bleakconnection, "backoff_delay", lambda attempt: 10):
+            poll = asyncio.create_task(
+                conn.async_make_request(STATUS_QUERY, lane=Lane.POLL)
+            )
+            await asyncio.sleep(0.01)  # first connect failed, backing off
+            # the shared query is served like a user command
+            await asyncio.wait_for(conn.async_make_request(STATUS_QUERY), 1)
+            self.assertTrue(poll.done())
+        self.assertEqual(self.thermostat.writes, [STATUS_QUERY])
+        self.assertEqual(conn.requests_coalesced, 1)
@@ -0,0 +1,85 @@
+import codecs
+from unittest import TestCase
+
+from eq3bt.decoder import (
+    MODE_AWAY,
+    _fast_decode_device_id,
+    _fast_decode_status,
+    decode_device_id,
+    decode_status,
+    device_id_from_container,
+    status_from_container,
+)
+from eq3bt.structures import DeviceId, ModeFlags, Status
+
+ID_RESPONSE = b"01780000807581626163606067659e"
+STATUS_RESPONSES = {
+    "auto": b"020100000428",
+    "manual": b"020101000428",
+    "window": b"020110000428",
+    "away": b"0201020004231d132e03",
+    "boost": b"020104000428",
+    "low_batt": b"020180000428",
+    "valve_at_22": b"020100160428",
+    "presets": b"020100000422000000001803282207",
+    "away_presets": b"0201020004231d132e031803282207",
+    "locked_dst": b"020128000428",
+    "offset_min": b"020100000422000000001803282200",
+    "offset_max": b"02010000042200000000180328220e",
+}
+
+
+def decode_hex(data):
+    return bytearray(codecs.decode(data, "hex"))
+
+
+class TestDecoder(TestCase):
+    def test_status_parity(self):
+        for key, response in STATUS_RESPONSES.items():
+            with self.subTest(key):
+                data = decode_hex(response)
+                fast = _fast_decode_status(memoryview(data))
+                self.assertIsNotNone(fast)
+                parsed = Status.parse(bytes(data))
+                self.assertEqual(fast, status_from_container(parsed))
+                self.assertEqual(fast.mode, ModeFlags.build(parsed.mode)[0])
+                self.assertEqual(fast.valve, parsed.valve)
+                self.assertEqual(fast.target_temp, parsed.target_temp)
+                if parsed.mode.AWAY:
+                    self.assertEqual(fast.away, parsed.away)
+                if parsed.presets is None:
+                    self.assertIsNone(fast.presets)
+                else:
+                    for name in fast.presets.__slots__:
+                        self.assertEqual(
+                            getattr(fast.presets, name), getattr(parsed.presets, name)
+                        )
+
+    def test_status_values(self):
+        status = decode_status(decode_hex(STATUS_RESPONSES["away_presets"]))
+        self.assertTrue(status.mode & MODE_AWAY)
+        self.assertEqual(status.target_temp, 17.5)
+        self.assertEqual(status.away.isoformat(), "2019-03-29T23:00:00")
+        self.assertEqual(status.presets.comfort_temp, 20.0)
+        self.assertEqual(status.presets.eco_temp, 17.0)
+        self.assertEqual(status.presets.offset, 0.0)
+
+    def test_status_fallback(self):
+        # trailing garbage is not a known layout, construct ignores it
+        data = decode_hex(STATUS_RESPONSES["auto"] + b"ff")
+        self.assertIsNone(_fast_decode_status(memoryview(data)))
+        self.assertEqual(decode_status(data), status_from_container(Status.parse(data)))
+
+    def test_status_malformed(self):
+        # away flag set without away data
+        data = decode_hex(b"020102000428")
+        self.assertIsNone(_fast_decode_status(memoryview(data)))
+        with self.assertRaises(Exception):
+            decode_status(data)
+
+    def test_device_id_parity(self):
+        data = decode_hex(ID_RESPONSE)
+        fast = _fast_decode_device_id(memoryview(data))
+        self.assertEqual(fast, device_id_from_container(DeviceId.parse(data)))
+        self.assertEqual(decode_device_id(data).version, 120)
+        self.assertEqual(decode_device_id(data).serial, "PEQ2130075")
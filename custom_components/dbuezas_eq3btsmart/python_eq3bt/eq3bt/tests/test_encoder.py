@@ -0,0 +1,168 @@
+import os
+import struct
+import timeit
+from datetime import datetime
+from unittest import TestCase, skipUnless
+
+from construct import Byte
+
+from eq3bt.encoder import (
+    BOOST_FRAMES,
+    ID_QUERY_FRAME,
+    LOCK_FRAMES,
+    MODE_FRAMES,
+    OFFSET_FRAMES,
+    PRESETS_FRAMES,
+    PROP_BOOST,
+    PROP_COMFORT_ECO_CONFIG,
+    PROP_LOCK,
+    PROP_MODE_WRITE,
+    PROP_OFFSET,
+    PROP_TEMPERATURE_WRITE,
+    PROP_WINDOW_OPEN_CONFIG,
+    SCHEDULE_QUERY_FRAMES,
+    TEMPERATURE_FRAMES,
+    WINDOW_OPEN_CONFIG_FRAMES,
+    away_payload,
+    info_query_frame,
+    is_idempotent,
+    offset_code,
+    response_prefix,
+    temperature_code,
+)
+from eq3bt.schedule import encode_frame
+from eq3bt.structures import AwayDataAdapter
+
+TEMPERATURES = [t / 2 for t in range(9, 61)]
+OFFSETS = [o / 2 for o in range(-7, 8)]
+
+
+def legacy_offset_frame(offset):
+    current = -3.5
+    values = {}
+    for i in range(15):
+        values[current] = i
+        current += 0.5
+    return struct.pack("BB", PROP_OFFSET, values[offset])
+
+
+class TestEncoder(TestCase):
+    def test_temperature_frames(self):
+        for temp in TEMPERATURES:
+            code = temperature_code(temp)
+            self.assertEqual(
+                TEMPERATURE_FRAMES[code],
+                struct.pack("BB", PROP_TEMPERATURE_WRITE, int(temp * 2)),
+            )
+            self.assertEqual(
+                MODE_FRAMES[0x40 | code],
+                struct.pack("BB", PROP_MODE_WRITE, 0x40 | int(temp * 2)),
+            )
+
+    def test_offset_frames(self):
+        for offset in OFFSETS:
+            self.assertEqual(
+                OFFSET_FRAMES[offset_code(offset)], legacy_offset_frame(offset)
+            )
+
+    def test_two_argument_frames(self):
+        for comfort in TEMPERATURES:
+            for eco in TEMPERATURES:
+                self.assertEqual(
+                    PRESETS_FRAMES[temperature_code(comfort)][temperature_code(eco)],
+                    struct.pack(
+                        "BBB", PROP_COMFORT_ECO_CONFIG, int(comfort * 2), int(eco * 2)
+                    ),
+                )
+            for duration in range(13):
+                self.assertEqual(
+                    WINDOW_OPEN_CONFIG_FRAMES[temperature_code(comfort)][duration],
+                    struct.pack(
+                        "BBB", PROP_WINDOW_OPEN_CONFIG, int(comfort * 2), duration
+                    ),
+                )
+
+    def test_flag_frames(self):
+        for value in (False, True):
+            self.assertEqual(BOOST_FRAMES[value], struct.pack("BB", PROP_BOOST, value))
+            self.assertEqual(LOCK_FRAMES[value], struct.pack("BB", PROP_LOCK, value))
+
+    def test_away_payload(self):
+        adapter = AwayDataAdapter(Byte[4])
+        for away_end in (
+            datetime(2019, 3, 29, 23, 0),
+            datetime(2023, 12, 31, 7, 30),
+            datetime(2099, 1, 1, 0, 10),
+        ):
+            self.assertEqual(away_payload(away_end), adapter.build(away_end))
+        with self.assertRaises(Exception):
+            away_payload(datetime(1999, 1, 1))
+
+    def test_info_query_frame(self):
+        now = datetime(2023, 4, 5, 6, 7, 8)
+        self.assertEqual(
+            info_query_frame(now), struct.pack("BBBBBBB", 3, 23, 4, 5, 6, 7, 8)
+        )
+
+    def test_idempotent(self):
+        self.assertTrue(is_idempotent(ID_QUERY_FRAME))
+        self.assertTrue(is_idempotent(SCHEDULE_QUERY_FRAMES[0]))
+        self.assertTrue(is_idempotent(info_query_frame(datetime.now())))
+        self.assertFalse(is_idempotent(TEMPERATURE_FRAMES[42]))
+        self.assertFalse(is_idempotent(BOOST_FRAMES[True]))
+
+    @skipUnless(os.environ.get("EQ3BT_BENCHMARK"), "set EQ3BT_BENCHMARK=1 to run")
+    def test_benchmark(self):
+        """Micro-benchmark of the lookup against the struct.pack based setters.
+
+        Timing dependent, so opt-in: EQ3BT_BENCHMARK=1 pytest -s -k benchmark
+        """
+        number = 20000
+        adapter_cls = AwayDataAdapter
+        away_end = datetime(2023, 12, 31, 7, 30)
+        cases = {
+            "target_temperature": (
+                lambda: struct.pack("BB", PROP_TEMPERATURE_WRITE, int(21.5 * 2)),
+                lambda: TEMPERATURE_FRAMES[temperature_code(21.5)],
+            ),
+            "boost": (
+                lambda: struct.pack("BB", PROP_BOOST, bool(True)),
+                lambda: BOOST_FRAMES[bool(True)],
+            ),
+            "presets": (
+                lambda: struct.pack(
+                    "BBB", PROP_COMFORT_ECO_CONFIG, int(21 * 2), int(17 * 2)
+                ),
+                lambda: PRESETS_FRAMES[temperature_code(21)][temperature_code(17)],
+            ),
+            "temperature_offset": (
+                lambda: legacy_offset_frame(1.5),
+                lambda: OFFSET_FRAMES[offset_code(1.5)],
+            ),
+            "away_until": (
+                lambda: struct.pack("BB", PROP_MODE_WRITE, 0x80 | 24)
+                + adapter_cls(Byte[4]).build(away_end),
+                lambda: MODE_FRAMES[0x80 | 24] + away_payload(away_end),
+            ),
+        }
+        total_legacy = total_lookup = 0.0
+        for name, (legacy, lookup) in cases.items():
+            self.assertEqual(legacy(), lookup())
+            legacy_time = min(timeit.repeat(legacy, number=number, repeat=3))
+            lookup_time = min(timeit.repeat(lookup, number=number, repeat=3))
+            total_legacy += legacy_time
+            total_lookup += lookup_time
+            print(
+                f"{name:20} struct.pack: {legacy_time * 1e6 / number:7.3f}us "
+                f"lookup: {lookup_time * 1e6 / number:7.3f}us"
+            )
+        self.assertLess(total_lookup, total_legacy)
+
+    def test_response_prefix(self):
+        self.assertEqual(response_prefix(ID_QUERY_FRAME), b"\x01")
+        self.assertEqual(response_prefix(info_query_frame(datetime.now())), b"\x02\x01")
+        self.assertEqual(response_prefix(TEMPERATURE_FRAMES[42]), b"\x02\x01")
+        self.assertEqual(response_prefix(SCHEDULE_QUERY_FRAMES[3]), b"\x21\x03")
+        self.assertEqual(
+            response_prefix(encode_frame(3, [(20.0, None)])), b"\x02\x02\x03"
+        )
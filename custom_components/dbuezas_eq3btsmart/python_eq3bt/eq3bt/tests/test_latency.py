@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+from eq3bt.latency import LatencyEstimator
+
+
+class TestLatencyEstimator(TestCase):
+    def test_initial(self):
+        estimator = LatencyEstimator(1, 10, 5)
+        self.assertEqual(estimator.timeout, 5)
+        self.assertEqual(LatencyEstimator(1, 4, 5).timeout, 4)
+        with self.assertRaises(ValueError):
+            LatencyEstimator(2, 1, 5)
+
+    def test_converges(self):
+        fast = LatencyEstimator(0.5, 10, 5)
+        for _ in range(50):
+            fast.add_sample(0.2)
+        self.assertAlmostEqual(fast.srtt, 0.2)
+        self.assertEqual(fast.timeout, 0.5)
+
+        slow = LatencyEstimator(0.5, 10, 5)
+        for rtt in (3, 4, 3.5, 4, 3) * 10:
+            slow.add_sample(rtt)
+        self.assertGreater(slow.timeout, 4)
+        self.assertLessEqual(slow.timeout, 10)
+
+    def test_backoff(self):
+        estimator = LatencyEstimator(1, 10, 3)
+        estimator.backoff()
+        self.assertEqual(estimator.timeout, 6)
+        estimator.backoff()
+        self.assertEqual(estimator.timeout, 10)
+        self.assertEqual(estimator.as_dict()["timeouts"], 2)
+
+    def test_percentile(self):
+        estimator = LatencyEstimator(1, 10, 5)
+        self.assertIsNone(estimator.percentile(0.9))
+        for rtt in range(1, 11):
+            estimator.add_sample(rtt / 10)
+        self.assertEqual(estimator.percentile(0.5), 0.6)
+        self.assertEqual(estimator.percentile(0.9), 1.0)
+        self.assertEqual(estimator.percentile(1), 1.0)
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import pytest
+
+from eq3bt.metrics import RETRY_BUCKETS, TIME_BUCKETS, Histogram, RequestMetrics
+
+
+class TestHistogram(TestCase):
+    def test_buckets(self):
+        histogram = Histogram(TIME_BUCKETS)
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (0.01, 0.3, 0.3, 0.7, 30):
+            histogram.add(value)
+        stats = histogram.as_dict()
+        self.assertEqual(stats["count"], 5)
+        self.assertEqual(stats["min"], 0.01)
+        self.assertEqual(stats["max"], 30)
+        self.assertEqual(stats["buckets"]["<=0.05"], 1)
+        self.assertEqual(stats["buckets"]["<=0.5"], 2)
+        self.assertEqual(stats["buckets"][">20"], 1)
+        self.assertEqual(stats["p50"], 0.5)
+        self.assertIsNone(stats["p95"])  # beyond the last bound
+        self.assertEqual(len(histogram.counts), len(TIME_BUCKETS) + 1)
+
+
+@pytest.mark.usefixtures("clock")
+class TestRequestMetrics(TestCase):
+    def test_phase_and_sessions(self):
+        clock = self.clock
+        metrics = RequestMetrics(clock=clock)
+        with metrics.phase("connect"):
+            clock.now = 1.5
+        with self.assertRaises(RuntimeError):
+            with metrics.phase("write"):
+                clock.now = 1.6
+                raise RuntimeError()
+        metrics.record_session("ok", 2.0, 1)
+        metrics.record_session("timeout", 9.0, 3)
+        metrics.record_session("ok", 0.5, 1)
+        stats = metrics.as_dict()
+        self.assertEqual(stats["phases"]["connect"]["max"], 1.5)
+        self.assertEqual(stats["phases"]["write"]["count"], 1)
+        self.assertEqual(stats["phases"]["resolve"]["count"], 0)
+        self.assertEqual(stats["outcomes"], {"ok": 2, "timeout": 1})
+        self.assertEqual(stats["attempts"]["buckets"]["<=3"], 1)
+        self.assertEqual(metrics.retries.buckets, RETRY_BUCKETS)
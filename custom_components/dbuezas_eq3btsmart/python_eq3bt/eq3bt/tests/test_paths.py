@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import pytest
+
+from eq3bt.paths import STICKY_HALF_LIFE, PathCache, PathSelector
+
+
+def sources(ranked):
+    return [candidate[0] for candidate in ranked]
+
+
+@pytest.mark.usefixtures("clock")
+class TestPathSelector(TestCase):
+    def test_rssi_breaks_ties(self):
+        selector = PathSelector()
+        ranked = selector.rank([("a", -90), ("b", -60), ("c", None)])
+        self.assertEqual(sources(ranked), ["b", "a", "c"])
+
+    def test_failures_and_load(self):
+        selector = PathSelector()
+        candidates = [("a", -60), ("b", -70)]
+        selector.record_failure("a")
+        selector.record_failure("a")
+        self.assertEqual(sources(selector.rank(candidates)), ["b", "a"])
+        load = {"a": 0, "b": 5}
+        self.assertEqual(sources(selector.rank(candidates, load.get)), ["a", "b"])
+
+    def test_slow_connects(self):
+        selector = PathSelector()
+        for _ in range(3):
+            selector.record_success("a", 4.0)
+            selector.record_success("b", 0.5)
+        selector.last_good = None
+        ranked = selector.rank([("a", -65), ("b", -70)])
+        self.assertEqual(sources(ranked), ["b", "a"])
+
+    def test_last_good_decays(self):
+        clock = self.clock
+        selector = PathSelector(clock=clock)
+        candidates = [("a", -60), ("b", -80)]
+        selector.record_success("b", 1.0)
+        self.assertEqual(sources(selector.rank(candidates))[0], "b")
+        clock.now = 4 * STICKY_HALF_LIFE
+        self.assertEqual(sources(selector.rank(candidates))[0], "a")
+        selector.record_failure("b")
+        self.assertIsNone(selector.last_good)
+        self.assertEqual(selector.as_dict()["paths"]["b"]["failures"], 1)
+
+    def test_median_connect_time(self):
+        selector = PathSelector()
+        self.assertIsNone(selector.median_connect_time("a"))
+        for connect_time in (1.0, 3.0, 2.0):
+            selector.record_success("a", connect_time)
+        self.assertEqual(selector.median_connect_time("a"), 2.0)
+
+
+@pytest.mark.usefixtures("clock")
+class TestPathCache(TestCase):
+    def test_best_and_age(self):
+        clock = self.clock
+        cache = PathCache(max_age=100, clock=clock)
+        self.assertIsNone(cache.best())
+        self.assertIsNone(cache.age)
+        cache.update("a", -80, "dev-a", "/org/bluez/hci0")
+        cache.update("b", -60, "dev-b")
+        self.assertEqual(cache.best().source, "b")
+        self.assertEqual(cache.best("/org/bluez/hci0").device, "dev-a")
+        clock.now = 50
+        cache.update("a", -70, "dev-a", "/org/bluez/hci0")
+        self.assertEqual(cache.age, 0)
+        clock.now = 120
+        self.assertEqual([path.source for path in cache.fresh()], ["a"])
+        self.assertEqual(cache.best().rssi, -70)
+        self.assertEqual(cache.age, 70)
+
+    def test_seen(self):
+        clock = self.clock
+        cache = PathCache(clock=clock)
+        cache.seen()
+        clock.now = 5
+        self.assertEqual(cache.age, 5)
+        self.assertIsNone(cache.best())
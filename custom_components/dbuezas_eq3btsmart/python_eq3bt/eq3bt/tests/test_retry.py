@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import pytest
+
+from eq3bt.retry import BreakerState, CircuitBreaker, backoff_delay
+
+
+class TestBackoff(TestCase):
+    def test_exponential(self):
+        upper = [backoff_delay(n, 0.25, 5, rand=lambda: 1.0) for n in range(1, 8)]
+        self.assertEqual(upper, [0.25, 0.5, 1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        for n in range(1, 10):
+            self.assertEqual(backoff_delay(n, rand=lambda: 0.0), 0)
+            self.assertLessEqual(backoff_delay(n), 5)
+
+
+@pytest.mark.usefixtures("clock")
+class TestCircuitBreaker(TestCase):
+    def test_opens_after_threshold(self):
+        clock = self.clock
+        breaker = CircuitBreaker(3, 10, 40, clock=clock)
+        self.assertFalse(breaker.record_failure())
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure())
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())
+        self.assertEqual(breaker.state, BreakerState.OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(breaker.retry_in, 10)
+
+    def test_half_open_probe(self):
+        clock = self.clock
+        breaker = CircuitBreaker(1, 10, 40, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, BreakerState.HALF_OPEN)
+        # a failed probe doubles the cool down
+        self.assertTrue(breaker.record_failure())
+        clock.now = 29
+        self.assertFalse(breaker.allow_request())
+        clock.now = 30
+        self.assertTrue(breaker.allow_request())
+        self.assertTrue(breaker.record_success())
+        self.assertTrue(breaker.is_closed)
+        self.assertEqual(breaker.as_dict()["opened"], 2)
+
+    def test_cool_down_is_capped(self):
+        clock = self.clock
+        breaker = CircuitBreaker(1, 10, 40, clock=clock)
+        breaker.record_failure()
+        for _ in range(5):
+            clock.now += breaker.retry_in
+            breaker.allow_request()
+            breaker.record_failure()
+        self.assertEqual(breaker.retry_in, 40)
@@ -0,0 +1,87 @@
+import codecs
+from datetime import time
+from unittest import TestCase
+
+from eq3bt.schedule import WeekSchedule, encode_frame
+from eq3bt.structures import HOUR_24_PLACEHOLDER, Schedule
+
+# sat: 17 until 06:00, 21 until 09:00, 17 until 24:00
+SCHEDULE_RESPONSE = b"210022242a3622900000000000000000"
+HOURS = [(17.0, time(6, 0)), (21.0, time(9, 0)), (17.0, None)]
+
+
+class TestWeekSchedule(TestCase):
+    def test_parity(self):
+        data = codecs.decode(SCHEDULE_RESPONSE, "hex")
+        schedule = WeekSchedule()
+        self.assertEqual(schedule.update_from_frame(data), 0)
+        parsed = Schedule.parse(data)
+        hours = schedule.hours("sat")
+        for (target_temp, next_change_at), entry in zip(hours, parsed.hours):
+            self.assertEqual(target_temp, entry.target_temp)
+            if next_change_at is None:
+                self.assertEqual(entry.next_change_at, HOUR_24_PLACEHOLDER)
+            else:
+                self.assertEqual(next_change_at, entry.next_change_at)
+        self.assertEqual(hours, HOURS)
+
+    def test_encode(self):
+        built = Schedule.build(
+            {
+                "cmd": "write",
+                "day": "mon",
+                "hours": [
+                    {"target_temp": 17, "next_change_at": time(6, 0)},
+                    {"target_temp": 21, "next_change_at": time(9, 0)},
+                    {"target_temp": 17, "next_change_at": HOUR_24_PLACEHOLDER},
+                ]
+                + [{"target_temp": 0, "next_change_at": time(0, 0)}] * 4,
+            }
+        )
+        self.assertEqual(encode_frame("mon", HOURS), built)
+        schedule = WeekSchedule()
+        schedule.update_from_frame(built)
+        self.assertEqual(schedule.frame("mon"), built)
+
+    def test_diff(self):
+        schedule = WeekSchedule()
+        schedule.update_from_frame(encode_frame("mon", HOURS))
+        schedule.update_from_frame(encode_frame("tue", HOURS))
+        other = schedule.copy()
+        self.assertEqual(schedule, other)
+        self.assertEqual(schedule.diff(other), [])
+        other.update_from_frame(encode_frame("tue", [(20.0, None)]))
+        self.assertNotEqual(schedule, other)
+        self.assertEqual(schedule.diff(other), [3])
+        self.assertEqual(schedule.diff(WeekSchedule()), [2, 3])
+
+    def test_attributes(self):
+        schedule = WeekSchedule()
+        schedule.update_from_frame(codecs.decode(SCHEDULE_RESPONSE, "hex"))
+        self.assertEqual(
+            schedule.as_attributes(),
+            {
+                "sat": {
+                    "day": "sat",
+                    "target_temp_0": 17.0,
+                    "next_change_at_0": "06:00:00",
+                    "target_temp_1": 21.0,
+                    "next_change_at_1": "09:00:00",
+                    "target_temp_2": 17.0,
+                }
+            },
+        )
+
+    def test_freshness(self):
+        schedule = WeekSchedule()
+        self.assertFalse(schedule.is_fresh("mon", 60))
+        schedule.update_from_frame(encode_frame("mon", HOURS))
+        self.assertTrue(schedule.is_fresh("mon", 60))
+        schedule.set_program("tue", schedule.program("mon"), updated=0.0)
+        self.assertFalse(schedule.is_fresh("tue", 60))
+        schedule.expire()
+        self.assertFalse(schedule.is_fresh("mon", 60))
+        self.assertEqual(schedule.program("mon"), schedule.program("tue"))
+        schedule.forget("mon")
+        self.assertNotIn("mon", schedule)
+        self.assertIsNone(schedule.updated_at("mon"))
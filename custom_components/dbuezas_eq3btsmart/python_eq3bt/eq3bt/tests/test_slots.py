@@ -0,0 +1,94 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from eq3bt.slots import SlotScheduler
+
+
+class TestSlotScheduler(IsolatedAsyncioTestCase):
+    async def test_limit(self):
+        scheduler = SlotScheduler()
+        running = []
+        peak = 0
+
+        async def session(device):
+            nonlocal peak
+            async with scheduler.slot("proxy", device, limit=2):
+                running.append(device)
+                peak = max(peak, len(running))
+                await asyncio.sleep(0.01)
+                running.remove(device)
+
+        await asyncio.gather(*(session(f"dev{i}") for i in range(6)))
+        self.assertEqual(peak, 2)
+        stats = scheduler.as_dict()["proxy"]
+        self.assertEqual(stats["acquired"], 6)
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["max_queue_depth"], 4)
+        self.assertGreater(stats["wait_max"], 0)
+
+    async def test_round_robin(self):
+        scheduler = SlotScheduler()
+        order = []
+
+        async def session(device):
+            async with scheduler.slot("proxy", device, limit=1):
+                order.append(device)
+                await asyncio.sleep(0)
+
+        async with scheduler.slot("proxy", "holder", limit=1):
+            tasks = [
+                asyncio.create_task(session(device))
+                for device in ("a", "a", "a", "b", "c")
+            ]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        self.assertEqual(order, ["a", "b", "c", "a", "a"])
+
+    async def test_cancelled_waiter(self):
+        scheduler = SlotScheduler()
+        async with scheduler.slot("proxy", "holder", limit=1):
+            task = asyncio.create_task(scheduler.slot("proxy", "a").__aenter__())
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.source("proxy").queue_depth, 1)
+            task.cancel()
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.source("proxy").queue_depth, 0)
+        self.assertEqual(scheduler.source("proxy").active, 0)
+
+    async def test_has_free_slot(self):
+        scheduler = SlotScheduler()
+        self.assertTrue(scheduler.has_free_slot("proxy", limit=1))
+        async with scheduler.slot("proxy", "holder", limit=1):
+            self.assertFalse(scheduler.has_free_slot("proxy"))
+        self.assertTrue(scheduler.has_free_slot("proxy"))
+
+    async def test_idle_holder_is_reclaimed(self):
+        scheduler = SlotScheduler()
+        slots = scheduler.source("proxy", limit=1)
+        await slots.acquire("idle")
+        slots.set_idle("idle", slots.release)
+        await asyncio.wait_for(slots.acquire("a"), 1)
+        self.assertEqual(slots.active, 1)
+        self.assertEqual(slots.as_dict()["reclaimed"], 1)
+
+    async def test_holder_going_idle_is_reclaimed(self):
+        scheduler = SlotScheduler()
+        slots = scheduler.source("proxy", limit=1)
+        await slots.acquire("busy")
+        task = asyncio.create_task(slots.acquire("a"))
+        await asyncio.sleep(0)
+        self.assertFalse(task.done())
+        slots.set_idle("busy", slots.release)
+        await asyncio.wait_for(task, 1)
+        self.assertEqual(slots.active, 1)
+
+    async def test_busy_holder_is_not_reclaimed(self):
+        scheduler = SlotScheduler()
+        slots = scheduler.source("proxy", limit=1)
+        await slots.acquire("idle")
+        slots.set_idle("idle", slots.release)
+        slots.clear_idle("idle")  # a new session started
+        task = asyncio.create_task(slots.acquire("a"))
+        await asyncio.sleep(0)
+        self.assertFalse(task.done())
+        task.cancel()
@@ -0,0 +1,86 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import pytest
+
+from eq3bt.tracing import NULL_SPAN, NULL_TRACER, Tracer, traced
+
+
+@pytest.mark.usefixtures("clock")
+class TestTracer(TestCase):
+    def test_disabled(self):
+        self.assertIs(NULL_TRACER.span("connect"), NULL_SPAN)
+        self.assertIs(NULL_TRACER.start("request", mac="aa"), NULL_SPAN)
+        with NULL_TRACER.span("connect") as span:
+            span.tag(source="proxy")
+        self.assertEqual(NULL_TRACER.export()["traceEvents"], [])
+
+    def test_nesting_and_export(self):
+        clock = self.clock
+        tracer = Tracer(clock=clock)
+        request = tracer.start("request", mac="aa", opcode="0x03")
+        with tracer.span("session", mac="aa") as session:
+            with tracer.span("connect") as connect:
+                clock.now = 1.0
+            with self.assertRaises(TimeoutError):
+                with tracer.span("notify_wait"):
+                    clock.now = 1.5
+                    raise TimeoutError()
+        request.finish("timeout")
+        self.assertIsNone(session.parent)
+        self.assertEqual(connect.parent, session.id)
+        self.assertEqual(connect.track, "aa")
+
+        events = tracer.export("aa")["traceEvents"]
+        by_name = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual(by_name["connect"]["dur"], 1_000_000)
+        self.assertEqual(by_name["notify_wait"]["args"]["outcome"], "TimeoutError")
+        begin = next(event for event in events if event["ph"] == "b")
+        self.assertEqual(begin["args"]["outcome"], "timeout")
+        self.assertEqual(begin["args"]["opcode"], "0x03")
+        self.assertIn("M", {event["ph"] for event in events})
+        self.assertEqual(tracer.export("bb")["traceEvents"], [])
+
+    def test_bounded(self):
+        tracer = Tracer(capacity=3)
+        for _ in range(10):
+            with tracer.span("write", mac="aa"):
+                pass
+        self.assertEqual(len(tracer.export()["traceEvents"]), 4)  # 3 + metadata
+
+    def test_labels(self):
+        tracer = Tracer()
+        for mac in ("aa", "bb"):
+            with tracer.span("session", mac=mac):
+                pass
+        events = tracer.export(labels={"aa": "this thermostat"})["traceEvents"]
+        names = [event["args"]["name"] for event in events if event["ph"] == "M"]
+        self.assertEqual(names, ["this thermostat", "device 2"])
+        self.assertNotIn("aa", str(events))
+        self.assertNotIn("bb", str(events))
+
+
+class Device:
+    mac = "aa"
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    @traced("set_mode")
+    async def async_set_mode(self):
+        with self.tracer.span("inner") as span:
+            await asyncio.sleep(0)
+            return span
+
+
+class TestTraced(IsolatedAsyncioTestCase):
+    async def test_parent(self):
+        tracer = Tracer()
+        inner = await Device(tracer).async_set_mode()
+        events = tracer.export()["traceEvents"]
+        setter = next(event for event in events if event["ph"] == "b")
+        self.assertEqual(setter["name"], "set_mode")
+        self.assertEqual(inner.parent, setter["args"]["span"])
+
+    async def test_disabled(self):
+        self.assertIs(await Device(NULL_TRACER).async_set_mode(), NULL_SPAN)
@@ -0,0 +1,199 @@
+"""
+Opt-in tracing of the request pipeline.
+
+Requests and setter calls get a span each, connection sessions get child
+spans per attempt and per phase. Finished spans are kept in a bounded
+buffer and can be exported as Chrome trace events, which chrome://tracing
+and https://ui.perfetto.dev can open. A disabled tracer hands out a shared
+no-op span, so tracing costs next to nothing unless it is switched on.
+"""
+from collections import deque
+from contextvars import ContextVar
+import functools
+import itertools
+import time
+
+TRACE_CAPACITY = 5000  # finished spans kept
+
+_current: ContextVar["Span | None"] = ContextVar("eq3bt_span", default=None)
+
+
+class Span:
+    """A timed operation with tags."""
+
+    __slots__ = (
+        "_tracer",
+        "name",
+        "id",
+        "parent",
+        "track",
+        "start",
+        "end",
+        "tags",
+        "is_async",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, is_async: bool, tags: dict):
+        parent = _current.get()
+        self._tracer = tracer
+        self.name = name
+        self.id = next(tracer._ids)
+        self.parent = parent.id if parent is not None else None
+        # the device the span belongs to, children inherit it
+        self.track = tags.get("mac") or (parent.track if parent else None)
+        self.tags = tags
+        self.is_async = is_async
+        self.start = tracer._clock()
+        self.end: float | None = None
+        self._token = None
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def finish(self, outcome: str = "ok"):
+        if self.end is not None:
+            return
+        self.end = self._tracer._clock()
+        self.tags["outcome"] = outcome
+        self._tracer._spans.append(self)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self.finish("ok" if exc_type is None else exc_type.__name__)
+        return False
+
+
+class _NullSpan:
+    """Stands in for a span while tracing is disabled."""
+
+    __slots__ = ()
+
+    def tag(self, **tags):
+        pass
+
+    def finish(self, outcome: str = "ok"):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects the spans of one or more devices."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        capacity: int = TRACE_CAPACITY,
+        clock=time.monotonic,
+    ):
+        self.enabled = enabled
+        self._clock = clock
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+
+    def span(self, name: str, **tags):
+        """A span for a with block, nested in the current one."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, False, tags)
+
+    def start(self, name: str, **tags):
+        """A span that may overlap others, finished by calling finish()."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, True, tags)
+
+    def clear(self):
+        self._spans.clear()
+
+    def export(
+        self, track: str | None = None, labels: dict[str, str] | None = None
+    ) -> dict:
+        """Finished spans as Chrome trace events, of a single device if given.
+        Sessions, attempts and phases nest on the device's thread, requests
+        and setter calls overlap and are exported as async events.
+        With labels, the threads are named by them instead of the mac, which is
+        left out of the events, devices without a label are numbered."""
+        tids: dict[str | None, int] = {}
+        events = []
+        for span in self._spans:
+            if track is not None and span.track != track:
+                continue
+            if (tid := tids.get(span.track)) is None:
+                tid = tids[span.track] = len(tids) + 1
+            args = {**span.tags, "span": span.id, "parent": span.parent}
+            if labels is not None:
+                args.pop("mac", None)
+            ts = round(span.start * 1e6)
+            if span.is_async:
+                common = {"name": span.name, "cat": "eq3bt", "pid": 1, "tid": tid}
+                common["id"] = span.id
+                events.append({**common, "ph": "b", "ts": ts, "args": args})
+                events.append({**common, "ph": "e", "ts": round(span.end * 1e6)})
+            else:
+                events.append(
+                    {
+                        "name": span.name,
+                        "cat": "eq3bt",
+                        "ph": "X",
+                        "ts": ts,
+                        "dur": round((span.end - span.start) * 1e6),
+                        "pid": 1,
+                        "tid": tid,
+                        "args": args,
+                    }
+                )
+        for name, tid in tids.items():
+            if labels is not None:
+                name = labels.get(name or "", f"device {tid}")
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": name or "unknown"},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+NULL_TRACER = Tracer(enabled=False, capacity=0)
+
+
+def traced(name: str):
+    """Trace an async Thermostat method, the tracer is taken from self.tracer."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return await func(self, *args, **kwargs)
+            span = tracer.start(name, mac=self.mac)
+            token = _current.set(span)
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as ex:
+                span.finish(type(ex).__name__)
+                raise
+            finally:
+                _current.reset(token)
+            span.finish()
+            return result
+
+        return wrapper
+
+    return decorator
@@ -6,11 +6,17 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.device_registry import format_mac
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import CONF_DEBUG_MODE, DOMAIN
+from .entity import Eq3Entity
+from .python_eq3bt.eq3bt.bleakconnection import (
+    EVENT_CONNECTED,
+    EVENT_RETRIES,
+    EVENT_RSSI,
+    EVENT_STATS,
+)
 from .python_eq3bt.eq3bt.eq3btsmart import Thermostat
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,31 +44,23 @@ async def async_setup_entry(
             MacSensor(eq3),
             RetriesSensor(eq3),
             PathSensor(eq3),
+            CoalescedRequestsSensor(eq3),
+            RequestTimeoutSensor(eq3),
+            CircuitSensor(eq3),
+            ConnectionSlotsSensor(eq3),
         ]
         async_add_entities(new_devices)
 
 
-class Base(SensorEntity):
-    def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
-
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
+class Base(Eq3Entity, SensorEntity):
+    """Sensor of an eQ-3 Bluetooth Smart thermostat."""
 
 
 class ValveSensor(Base):
+    _update_fields = {"valve_state", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Valve"
         self._attr_icon = "mdi:pipe-valve"
         self._attr_native_unit_of_measurement = "%"
@@ -73,9 +71,10 @@ class ValveSensor(Base):
 
 
 class AwayEndSensor(Base):
+    _update_fields = {"away", "away_end", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Away until"
         self._attr_device_class = "date"
 
@@ -87,7 +86,10 @@ class AwayEndSensor(Base):
 class RssiSensor(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(),
+            {EVENT_CONNECTED, EVENT_RSSI},
+        )
         self._attr_name = "Rssi"
         self._attr_native_unit_of_measurement = "dBm"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -98,9 +100,10 @@ class RssiSensor(Base):
 
 
 class SerialNumberSensor(Base):
+    _update_fields = {"device_serial", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Serial"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -110,14 +113,19 @@ class SerialNumberSensor(Base):
 
 
 class FirmwareVersionSensor(Base):
+    _update_fields = {"firmware_version", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Firmware Version"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     async def async_added_to_hass(self) -> None:
-        asyncio.get_event_loop().create_task(self.fetch_serial())
+        await super().async_added_to_hass()
+        if self._thermostat.is_device_data_fresh():
+            self.update_device_registry()
+        else:
+            asyncio.get_event_loop().create_task(self.fetch_serial())
 
     async def fetch_serial(self):
         try:
@@ -125,7 +133,9 @@ class FirmwareVersionSensor(Base):
         except Exception as e:
             _LOGGER.error(f"[{self._thermostat.name}] Error fetching serial number: {e}")
             return
+        self.update_device_registry()
 
+    def update_device_registry(self):
         device_registry = dr.async_get(self.hass)
         device = device_registry.async_get_device(
             identifiers={(DOMAIN, self._thermostat.mac)},
@@ -161,7 +171,9 @@ class MacSensor(Base):
 class RetriesSensor(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_RETRIES}
+        )
         self._attr_name = "Retries"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -170,10 +182,97 @@ class RetriesSensor(Base):
         return self._thermostat._conn.retries
 
 
+class CoalescedRequestsSensor(Base):
+    def __init__(self, _thermostat: Thermostat):
+        super().__init__(_thermostat)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_STATS}
+        )
+        self._attr_name = "Coalesced Requests"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def state(self):
+        return self._thermostat._conn.requests_coalesced
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "requests_total": self._thermostat._conn.requests_total,
+            "requests_superseded": self._thermostat._conn.requests_superseded,
+            "requests_deferred": self._thermostat._conn.requests_deferred,
+        }
+
+
+class RequestTimeoutSensor(Base):
+    def __init__(self, _thermostat: Thermostat):
+        super().__init__(_thermostat)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_STATS}
+        )
+        self._attr_name = "Request Timeout"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_native_unit_of_measurement = "s"
+
+    @property
+    def state(self):
+        return round(self._thermostat._conn.latency.timeout, 3)
+
+    @property
+    def extra_state_attributes(self):
+        return self._thermostat._conn.latency_stats()
+
+
+class CircuitSensor(Base):
+    def __init__(self, _thermostat: Thermostat):
+        super().__init__(_thermostat)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(),
+            {EVENT_RETRIES, EVENT_STATS},
+        )
+        self._attr_name = "Circuit"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def state(self):
+        return self._thermostat._conn.breaker.state.value
+
+    @property
+    def extra_state_attributes(self):
+        return self._thermostat._conn.breaker.as_dict()
+
+
+class ConnectionSlotsSensor(Base):
+    def __init__(self, _thermostat: Thermostat):
+        super().__init__(_thermostat)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(),
+            {EVENT_CONNECTED, EVENT_STATS},
+        )
+        self._attr_name = "Connection Slots"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def state(self):
+        scheduler = self._thermostat._conn.scheduler
+        if scheduler is None:
+            return None
+        stats = scheduler.as_dict().get(self._thermostat._conn.source, {})
+        return stats.get("queue_depth")
+
+    @property
+    def extra_state_attributes(self):
+        scheduler = self._thermostat._conn.scheduler
+        return scheduler.as_dict() if scheduler is not None else {}
+
+
 class PathSensor(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(),
+            {EVENT_CONNECTED, EVENT_STATS},
+        )
         self._attr_name = "Path"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
@@ -186,3 +285,14 @@ class PathSensor(Base):
             return None
 
         return self._thermostat._conn._conn._backend._device_path
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            **self._thermostat._conn.paths.as_dict(),
+            "hedges_started": self._thermostat._conn.hedges_started,
+            "hedges_won": self._thermostat._conn.hedges_won,
+            "warm_ups": self._thermostat._conn.warm_ups,
+            "warm_up_lead": round(self._thermostat._conn.warm_up_lead, 2),
+            "advertisements": self._thermostat._conn.advertisements.as_dict(),
+        }
@@ -1,15 +1,16 @@
 from .const import CONF_DEBUG_MODE, DOMAIN
+from .entity import Eq3Entity
 import logging
 
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.device_registry import format_mac
+from .python_eq3bt.eq3bt.bleakconnection import EVENT_CONNECTED
 from .python_eq3bt.eq3bt.eq3btsmart import (
     EQ3BT_MAX_TEMP,
     EQ3BT_OFF_TEMP,
     Thermostat,
 )
-from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -50,30 +51,18 @@ async def async_setup_entry(
     )
 
 
-class Base(SwitchEntity):
-    def __init__(self, _thermostat: Thermostat):
-        self._thermostat = _thermostat
-        self._attr_has_entity_name = True
-
-    @property
-    def unique_id(self) -> str:
-        assert self.name
-        return format_mac(self._thermostat.mac) + "_" + self.name
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._thermostat.mac)},
-        )
+class Base(Eq3Entity, SwitchEntity):
+    """Switch of an eQ-3 Bluetooth Smart thermostat."""
 
     async def set_away_until(self, away_until, temperature: float) -> None:
         pass
 
 
 class AwaySwitch(Base):
+    _update_fields = {"away", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Away"
         self._attr_icon = "mdi:lock"
 
@@ -92,9 +81,10 @@ class AwaySwitch(Base):
 
 
 class BoostSwitch(Base):
+    _update_fields = {"boost", "available"}
+
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat.register_update_callback(self.schedule_update_ha_state)
         self._attr_name = "Boost"
         self._attr_icon = "mdi:speedometer"
 
@@ -112,7 +102,9 @@ class BoostSwitch(Base):
 class ConnectionSwitch(Base):
     def __init__(self, _thermostat: Thermostat):
         super().__init__(_thermostat)
-        _thermostat._conn.register_connection_callback(self.schedule_update_ha_state)
+        _thermostat._conn.register_connection_callback(
+            lambda changed: self.schedule_update_ha_state(), {EVENT_CONNECTED}
+        )
         self._attr_name = "Connection"
         self._attr_icon = "mdi:bluetooth"
         self._attr_assumed_state = True